@@ -3,23 +3,79 @@ Aplicación CML - Main Window
 Versión refactorizada y modular
 """
 import sys
-from PySide6.QtWidgets import QApplication, QMainWindow, QWidget, QHBoxLayout, QVBoxLayout, QTableWidgetItem, QPushButton, QMessageBox, QLabel
-from PySide6.QtCore import Qt
+import math
+import queue
+import logging
+import logging.handlers
+import functools
+from contextlib import contextmanager
+from PySide6.QtWidgets import QApplication, QMainWindow, QWidget, QHBoxLayout, QVBoxLayout, QMessageBox, QLabel
+from PySide6.QtCore import Qt, QSignalBlocker, QTimer, Slot
 from PySide6.QtGui import QColor, QBrush
 
 from ui.styles import STYLES
 from ui.sidebar import Sidebar
-from ui.helpers import add_shadow, create_card_title
+from ui.helpers import add_shadow, create_card_title, format_param_rows
 from ui.clinical_handler import ClinicalDataHandler
-# Lazy loading: importar bajo demanda en métodos específicos
-# from ui.optimizer_core import (...)
-# from ui.projection_scenarios import (...)
+# Lazy loading: ui.optimizer_core y ui.projection_scenarios (numpy/scipy) se
+# importan al primer uso mediante _optimizer_core() / _projection()
 from ui.cards.simulation import create_simulation_card
 from ui.cards.scenarios import create_scenarios_card
 from ui.cards.projection import create_projection_card
 from ui.cards.patient import create_patient_card
 from ui.cards.history import create_history_card
 
+log = logging.getLogger("cml")
+
+
+@functools.cache
+def _optimizer_core():
+    """Módulo ui.optimizer_core, importado una sola vez al primer uso"""
+    import ui.optimizer_core as optimizer_core
+    return optimizer_core
+
+
+@functools.cache
+def _projection():
+    """Módulo ui.projection_scenarios, importado una sola vez al primer uso"""
+    import ui.projection_scenarios as projection_scenarios
+    return projection_scenarios
+
+
+# Datos demográficos de los pacientes precargados
+_PATIENT_DATA = {
+    "Christopher Martin Jimenez Osorio": {'edad': '23', 'clave': '517259', 'sexo': 'Masculino'},
+    "Paciente Clase B (TFR Exitosa)": {'edad': '45', 'clave': 'CLASS-B', 'sexo': 'Femenino'},
+    "Paciente Clase A (Recurrencia)": {'edad': '52', 'clave': 'CLASS-A', 'sexo': 'Masculino'},
+    "Paciente Clase C (Recurrencia Tardía)": {'edad': '38', 'clave': 'CLASS-C', 'sexo': 'Femenino'},
+    "Paciente Manual": {'edad': '', 'clave': 'MANUAL', 'sexo': ''},
+}
+_UNKNOWN_PATIENT = {'edad': '—', 'clave': '—', 'sexo': '—'}
+
+# Escenarios de cada estrategia del combo, indexados como sus ítems:
+# (mes_inicio, mes_fin, dosis %) relativos al último mes del historial
+_STRATEGY_SCENARIOS = (
+    # 0: Opción vacía - no hacer nada
+    (),
+    # 1: Manual - no hacer nada, usuario define
+    (),
+    # 2: MR4+36M (Control - Dosis completa): 36 meses a dosis completa después de MR4
+    ((0, 36, 100.0), (37, 120, 0.0)),  # Suspensión
+    # 3: MR4+24M+12M50% (DESTINY estándar): 24 meses completa + 12 meses al 50%
+    ((0, 24, 100.0), (25, 36, 50.0), (37, 120, 0.0)),
+    # 4: MR4+24M+12M25% (DESTINY 25%): 24 meses completa + 12 meses al 25%
+    ((0, 24, 100.0), (25, 36, 25.0), (37, 120, 0.0)),
+    # 5: MR4+12M+12M50%+12M25% (Escalonada - PROPUESTA NOVEDOSA)
+    #    12 meses completa + 12 al 50% + 12 al 25%; usa solo 58% de la droga total
+    ((0, 12, 100.0), (13, 24, 50.0), (25, 36, 25.0), (37, 120, 0.0)),
+    # 6: MR4+12M+24M50% (Reducción prolongada): solo 12 meses completa + 24 meses reducida
+    ((0, 12, 100.0), (13, 36, 50.0), (37, 120, 0.0)),
+    # 7: MR4+36M50% (Reducción inmediata 50%) después de MR4
+    ((0, 36, 50.0), (37, 120, 0.0)),
+    # 8: MR4+36M25% (Reducción inmediata 25%) después de MR4
+    ((0, 36, 25.0), (37, 120, 0.0)),
+)
+
 
 class MainWindow(QMainWindow):
     def __init__(self):
@@ -39,14 +95,34 @@ class MainWindow(QMainWindow):
         # Thread de optimización
         self.optimization_thread = None
         
+        # Caché de datos clínicos extraídos del historial (se invalida al editar la tabla)
+        self._clinical_cache = None
+        self._clinical_dirty = True
+        
+        # Parámetros optimizados leídos de disco, por paciente (se invalida al guardar)
+        self._param_cache = {}
+        
+        # Última fila cargada en los campos desde cada tabla (-1 = ninguna)
+        self._hist_sel_row = -1
+        self._scen_sel_row = -1
+        
+        # Debounce del combo de pacientes: solo se carga la última selección de una ráfaga
+        self._patient_debounce = QTimer(self)
+        self._patient_debounce.setSingleShot(True)
+        self._patient_debounce.setInterval(80)
+        self._patient_debounce.timeout.connect(self._do_patient_selected)
+        
+        # Diálogos reutilizables
+        self._create_message_boxes()
+        
         # Construir UI
         self._build_ui()
         
-        # Conectar señales
+        # Conectar señales (las de la fila de proyección se conectan al instalarla)
         self._connect_signals()
         
-        # Cargar datos iniciales
-        self._load_initial_data()
+        # Lista de pacientes: se llena después del primer frame
+        QTimer.singleShot(0, self._populate_patient_list)
     
     def _build_ui(self):
         """Construye la interfaz gráfica"""
@@ -65,29 +141,25 @@ class MainWindow(QMainWindow):
         # Título principal centrado, ancho y visible
         title_label = QLabel("CML PREDICCIÓN")
         title_label.setAlignment(Qt.AlignCenter)
-        title_label.setStyleSheet("font-size: 24px; font-weight: bold; color: #1e7d2d; background: none; margin-bottom: 12px; margin-top: 6px; letter-spacing: 2px; padding-left: 16px; padding-right: 16px;")
+        title_label.setObjectName("app_title")
         area_layout.addWidget(title_label)
 
-        # Crear cards
+        # Crear cards de paciente e historial (la fila de proyección se difiere)
         self._setup_cards()
 
-        # Agregar cards al área
+        # Agregar cards al área; la fila de escenarios/proyección se construye
+        # después del primer frame para que la ventana aparezca antes
         area_layout.addWidget(self._create_patient_row(), 1)
-        area_layout.addWidget(self._create_projection_row(), 2)
+        self._area_layout = area_layout
+        self._projection_placeholder = QWidget()
+        area_layout.addWidget(self._projection_placeholder, 2)
+        QTimer.singleShot(0, self._install_projection_row)
 
         # Agregar al layout principal (sin sidebar)
         main_layout.addWidget(area, 1)
     
     def _setup_cards(self):
-        """Crea todas las cards"""
-        # Escenarios de tratamiento (reemplaza simulación)
-        self.card_scenarios, scenarios_w = create_scenarios_card()
-        add_shadow(self.card_scenarios)
-        
-        # Proyección
-        self.card_proj, proj_w = create_projection_card()
-        add_shadow(self.card_proj)
-        
+        """Crea las cards de paciente e historial"""
         # Paciente
         self.card_patient, patient_w = create_patient_card()
         add_shadow(self.card_patient)
@@ -97,59 +169,94 @@ class MainWindow(QMainWindow):
         add_shadow(self.card_hist)
         
         # Guardar referencias
-        self._store_widget_refs(scenarios_w, proj_w, patient_w, hist_w)
+        self._store_widget_refs(patient_w, hist_w)
+    
+    def _setup_projection_cards(self):
+        """Crea las cards de escenarios y proyección"""
+        # Escenarios de tratamiento (reemplaza simulación)
+        self.card_scenarios, scenarios_w = create_scenarios_card()
+        add_shadow(self.card_scenarios)
+        
+        # Proyección
+        self.card_proj, proj_w = create_projection_card()
+        add_shadow(self.card_proj)
+        
+        # Guardar referencias
+        self._store_projection_refs(scenarios_w, proj_w)
         
         # Agregar títulos
         if self.card_scenarios.layout():
             self.card_scenarios.layout().insertWidget(0, create_card_title("Escenarios de Tratamiento"))
     
-    def _store_widget_refs(self, scenarios_w, proj_w, patient_w, hist_w):
-        """Almacena referencias a widgets importantes"""
-        # Escenarios de tratamiento
-        self.scenarios_table = scenarios_w.get('table')
-        self.mes_inicio_spin = scenarios_w.get('mes_inicio_spin')
-        self.duracion_spin = scenarios_w.get('duracion_spin')
-        self.mes_fin_lbl = scenarios_w.get('mes_fin_lbl')
-        self.dosis_spin = scenarios_w.get('dosis_spin')
-        self.scenario_add_btn = scenarios_w.get('btn_add')
-        self.scenario_update_btn = scenarios_w.get('btn_update')
-        self.scenario_delete_btn = scenarios_w.get('btn_delete')
-        self.strategy_combo = scenarios_w.get('strategy_combo')
-        
-        # Proyección
-        self.btn_optimize = proj_w.get('btn_optimize')
-        self.btn_project = proj_w.get('btn_project')
-        self.view_optimize = proj_w.get('view_optimize')
-        self.view_project = proj_w.get('view_project')
-        self.start_btn = proj_w.get('start_btn')
-        self.stop_btn = proj_w.get('stop_btn')
-        self.sim_progress = proj_w.get('proj_progress')
-        self.results_table = proj_w.get('results_table')
-        self.restarts_spin = proj_w.get('restarts_spin')
-        self.pop_spin = proj_w.get('pop_spin')
-        self.gens_spin = proj_w.get('gens_spin')
-        self.project_btn = proj_w.get('project_btn')
-        self.plot_opt_btn = proj_w.get('plot_opt_btn')
-        self.actions_widget = proj_w.get('actions_widget')
-        self.actions_layout = proj_w.get('actions_layout')
-        self.actions_widget = proj_w.get('actions_widget')
-        self.actions_layout = proj_w.get('actions_layout')
+    def _install_projection_row(self):
+        """Construye la fila de escenarios/proyección y reemplaza el placeholder"""
+        self._setup_projection_cards()
+        row = self._create_projection_row()
+        self._area_layout.replaceWidget(self._projection_placeholder, row)
+        self._projection_placeholder.deleteLater()
+        self._projection_placeholder = None
+        self.results_table.resizeColumnToContents(0)  # ancho inicial (solo encabezado)
         
+        self._connect_projection_signals()
+        self._load_initial_data()
+    
+    def _populate_patient_list(self):
+        """Llena el combo de pacientes en un solo lote (sin pre-seleccionar)"""
+        # Sin señales: el item vacío queda seleccionado igual que al construir la card
+        with QSignalBlocker(self.patient_combo):
+            self.patient_combo.addItems(["", *_PATIENT_DATA])
+    
+    def _store_widget_refs(self, patient_w, hist_w):
+        """Almacena referencias a widgets de paciente e historial"""
         # Paciente
-        self.patient_nombre = patient_w.get('patient_nombre')
-        self.patient_edad = patient_w.get('patient_edad')
-        self.patient_clave = patient_w.get('patient_clave')
-        self.patient_sexo = patient_w.get('patient_sexo')
-        self.patient_combo = patient_w.get('patient_combo')
+        self.patient_nombre = patient_w['patient_nombre']
+        self.patient_edad = patient_w['patient_edad']
+        self.patient_clave = patient_w['patient_clave']
+        self.patient_sexo = patient_w['patient_sexo']
+        self.patient_combo = patient_w['patient_combo']
         
         # Historial
-        self.tabla = hist_w.get('tabla')
-        self.mes_input = hist_w.get('mes_input')
-        self.dosis_input = hist_w.get('dosis_input')
-        self.porc_input = hist_w.get('porc_input')
-        self.hist_add_btn = hist_w.get('add_btn')
-        self.hist_update_btn = hist_w.get('update_btn')
-        self.hist_del_btn = hist_w.get('del_btn')
+        self.tabla = hist_w['tabla']
+        self.hist_model = self.tabla.model()
+        self.mes_input = hist_w['mes_input']
+        self.dosis_input = hist_w['dosis_input']
+        self.porc_input = hist_w['porc_input']
+        self.hist_add_btn = hist_w['add_btn']
+        self.hist_update_btn = hist_w['update_btn']
+        self.hist_del_btn = hist_w['del_btn']
+    
+    def _store_projection_refs(self, scenarios_w, proj_w):
+        """Almacena referencias a widgets de escenarios y proyección"""
+        # Escenarios de tratamiento
+        self.scenarios_table = scenarios_w['table']
+        self.scenarios_model = self.scenarios_table.model()
+        self.mes_inicio_spin = scenarios_w['mes_inicio_spin']
+        self.duracion_spin = scenarios_w['duracion_spin']
+        self.mes_fin_lbl = scenarios_w['mes_fin_lbl']
+        self.dosis_spin = scenarios_w['dosis_spin']
+        self.scenario_add_btn = scenarios_w['btn_add']
+        self.scenario_update_btn = scenarios_w['btn_update']
+        self.scenario_delete_btn = scenarios_w['btn_delete']
+        self.strategy_combo = scenarios_w['strategy_combo']
+        
+        # Proyección
+        self.btn_optimize = proj_w['btn_optimize']
+        self.btn_project = proj_w['btn_project']
+        self.view_optimize = proj_w['view_optimize']
+        self.view_project = proj_w['view_project']
+        self.start_btn = proj_w['start_btn']
+        self.stop_btn = proj_w['stop_btn']
+        self.sim_progress = proj_w['proj_progress']
+        self.results_table = proj_w['results_table']
+        self.results_model = self.results_table.model()
+        self.restarts_spin = proj_w['restarts_spin']
+        self.pop_spin = proj_w['pop_spin']
+        self.gens_spin = proj_w['gens_spin']
+        self.project_btn = proj_w['project_btn']
+        self.plot_opt_btn = proj_w['plot_opt_btn']
+        self.actions_widget = proj_w['actions_widget']
+        self.plots_btn = proj_w['plots_btn']
+        self.save_btn = proj_w['save_btn']
     
     def _create_patient_row(self):
         """Crea fila con cards de paciente e historial"""
@@ -172,15 +279,7 @@ class MainWindow(QMainWindow):
         return row
     
     def _connect_signals(self):
-        """Conecta todas las señales"""
-        # Botones de optimización
-        self.start_btn.clicked.connect(self._on_start_optimization)
-        self.stop_btn.clicked.connect(self._on_stop_optimization)
-        self.project_btn.clicked.connect(self._on_projection_button_clicked)
-        self.plot_opt_btn.clicked.connect(self._on_show_optimization_plots)
-        
-        # Tab widget de proyección (no necesita conexión)
-        
+        """Conecta las señales de paciente e historial"""
         # Pacientes
         self.patient_combo.currentIndexChanged.connect(self._on_patient_selected)
         
@@ -188,21 +287,43 @@ class MainWindow(QMainWindow):
         self.hist_add_btn.clicked.connect(self._on_add_history_row)
         self.hist_update_btn.clicked.connect(self._on_update_history_row)
         self.hist_del_btn.clicked.connect(self._on_delete_history_row)
-        self.tabla.itemSelectionChanged.connect(self._on_history_selection)
+        self.tabla.selectionModel().selectionChanged.connect(self._on_history_selection)
+        
+        # Invalidar caché de datos clínicos ante cualquier cambio del historial
+        for signal in (self.hist_model.rowsInserted, self.hist_model.rowsRemoved,
+                       self.hist_model.dataChanged, self.hist_model.modelReset):
+            signal.connect(self._invalidate_clinical_cache)
+            signal.connect(self._forget_history_row)
+    
+    def _connect_projection_signals(self):
+        """Conecta las señales de escenarios y proyección (fila diferida)"""
+        # Botones de optimización
+        self.start_btn.clicked.connect(self._on_start_optimization)
+        self.stop_btn.clicked.connect(self._on_stop_optimization)
+        self.project_btn.clicked.connect(self._on_projection_button_clicked)
+        self.plot_opt_btn.clicked.connect(self._on_show_optimization_plots)
+        self.plots_btn.clicked.connect(self._on_show_plots)
+        self.save_btn.clicked.connect(self._on_save_results)
+        
+        # Tab widget de proyección (no necesita conexión)
         
         # Escenarios
         self.scenario_add_btn.clicked.connect(self._on_add_scenario_row)
         self.scenario_update_btn.clicked.connect(self._on_update_scenario_row)
         self.scenario_delete_btn.clicked.connect(self._on_delete_scenario_row)
-        self.scenarios_table.itemSelectionChanged.connect(self._on_scenario_selection)
+        self.scenarios_table.selectionModel().selectionChanged.connect(self._on_scenario_selection)
         self.strategy_combo.currentIndexChanged.connect(self._on_apply_strategy)
         self.duracion_spin.valueChanged.connect(self._on_duracion_changed)
         self.mes_inicio_spin.valueChanged.connect(self._on_mes_inicio_changed)
+        for signal in (self.scenarios_model.rowsInserted, self.scenarios_model.rowsRemoved,
+                       self.scenarios_model.dataChanged, self.scenarios_model.modelReset):
+            signal.connect(self._forget_scenario_row)
         
         # Conectar cambios en historial para actualizar mes inicio automáticamente
-        self.tabla.model().rowsInserted.connect(self._update_mes_inicio_from_history)
-        self.tabla.model().rowsRemoved.connect(self._update_mes_inicio_from_history)
-        self.tabla.model().dataChanged.connect(self._update_mes_inicio_from_history)
+        self.hist_model.rowsInserted.connect(self._update_mes_inicio_from_history)
+        self.hist_model.rowsRemoved.connect(self._update_mes_inicio_from_history)
+        self.hist_model.dataChanged.connect(self._update_mes_inicio_from_history)
+        self.hist_model.modelReset.connect(self._update_mes_inicio_from_history)
     
     def _load_initial_data(self):
         """Carga datos iniciales"""
@@ -210,28 +331,80 @@ class MainWindow(QMainWindow):
         # Inicializar estado del checkbox de continuación
         self._update_mes_inicio_from_history()
     
+    @Slot()
+    def _invalidate_clinical_cache(self, *args):
+        """Marca los datos clínicos como desactualizados"""
+        self._clinical_dirty = True
+    
+    def _get_clinical_data(self):
+        """Datos clínicos del historial, extraídos solo si la tabla cambió"""
+        if self._clinical_dirty or self._clinical_cache is None:
+            self._clinical_cache = ClinicalDataHandler.get_clinical_data_from_table(self.tabla)
+            self._clinical_dirty = False
+        return self._clinical_cache
+    
+    @staticmethod
+    @contextmanager
+    def _editing_table(table):
+        """Edita una tabla sin disparar su handler de selección ni repintar por cada cambio"""
+        with QSignalBlocker(table.selectionModel()):
+            table.setUpdatesEnabled(False)
+            try:
+                yield
+            finally:
+                table.setUpdatesEnabled(True)
+    
+    def _make_box(self, icon, name):
+        """QMessageBox con el objectName que usa STYLES (warn_box, info_box, error_box)"""
+        box = QMessageBox(self)
+        box.setObjectName(name)
+        box.setIcon(icon)
+        box.setStandardButtons(QMessageBox.Ok)
+        return box
+    
+    def _create_message_boxes(self):
+        """Crea una vez los diálogos de aviso, información y error (se reutilizan)"""
+        # Estilo en STYLES (fondo blanco; texto rojo en QMessageBox#warn_box)
+        self._warn_box = self._make_box(QMessageBox.Warning, "warn_box")
+        self._info_box = self._make_box(QMessageBox.Information, "info_box")
+        self._error_box = self._make_box(QMessageBox.Critical, "error_box")
+    
+    def _show_box(self, box, title, message):
+        # Si el diálogo reutilizable sigue abierto (p.ej. el aviso de inicio cuando
+        # la optimización ya terminó), se muestra uno nuevo en vez de pisarlo
+        if box.isVisible():
+            box = self._make_box(box.icon(), box.objectName())
+            box.setAttribute(Qt.WA_DeleteOnClose)
+        box.setWindowTitle(title)
+        box.setText(message)
+        box.exec()
+    
+    def _get_patient_params(self, patient_name):
+        """(params, error) guardados del paciente; el JSON se lee solo la primera vez"""
+        cached = self._param_cache.get(patient_name)
+        if cached is None:
+            cached = _projection().load_patient_parameters(patient_name)
+            self._param_cache[patient_name] = cached
+        return cached
+    
     def _show_warning_red(self, title, message):
         """Muestra un QMessageBox warning con texto en rojo"""
-        msg_box = QMessageBox(self)
-        msg_box.setWindowTitle(title)
-        msg_box.setText(message)
-        msg_box.setIcon(QMessageBox.Warning)
-        msg_box.setStandardButtons(QMessageBox.Ok)
-        msg_box.setStyleSheet("QMessageBox { background-color: white; } QLabel { background-color: white; }")
-        
-        # Aplicar color rojo al texto
-        label = msg_box.findChild(QLabel)
-        if label:
-            label.setStyleSheet("color: red; font-weight: bold; background-color: white;")
-        
-        msg_box.exec()
+        self._show_box(self._warn_box, title, message)
+    
+    def _show_info(self, title, message):
+        """Muestra un QMessageBox informativo"""
+        self._show_box(self._info_box, title, message)
+    
+    def _show_error(self, title, message):
+        """Muestra un QMessageBox de error"""
+        self._show_box(self._error_box, title, message)
     
     # ========== OPTIMIZACIÓN ==========
     def _start_optimization(self):
         """Inicia la optimización genética"""
         # Prevenir inicio si ya hay una optimización corriendo
         if self.optimization_thread and self.optimization_thread.isRunning():
-            print("⚠ Ya hay una optimización en ejecución")
+            log.warning("⚠ Ya hay una optimización en ejecución")
             return
             
         self.start_btn.setEnabled(False)
@@ -240,9 +413,9 @@ class MainWindow(QMainWindow):
         self.actions_widget.setVisible(False)
         
         # Extraer datos clínicos
-        clinical_data = ClinicalDataHandler.get_clinical_data_from_table(self.tabla)
+        clinical_data = self._get_clinical_data()
         
-        if not clinical_data:
+        if clinical_data.size == 0:
             self.start_btn.setEnabled(True)
             self.stop_btn.setEnabled(False)
             self._show_warning_red("Advertencia", "⚠️ Sin datos clínicos para optimizar.\n\nPor favor, carga datos en el historial de medicación.")
@@ -256,12 +429,10 @@ class MainWindow(QMainWindow):
         pop_size = self.pop_spin.value()
         generations = self.gens_spin.value()
         
-        # Importar bajo demanda
-        from ui.optimizer_core import OptimizationThread
-        
-        # Crear thread de optimización
-        self.optimization_thread = OptimizationThread(
-            clinical_data, 
+        # Crear thread de optimización (datos clínicos como arreglos contiguos)
+        optimizer_core = _optimizer_core()
+        self.optimization_thread = optimizer_core.OptimizationThread(
+            optimizer_core.prepare_clinical_arrays(clinical_data),
             patient_name,
             restarts=restarts,
             pop_size=pop_size,
@@ -272,192 +443,98 @@ class MainWindow(QMainWindow):
         self.optimization_thread.finished.connect(self._on_optimization_finished)
         self.optimization_thread.error.connect(self._on_optimization_error)
         self.optimization_thread.start()        
-        msg_box_obj = QMessageBox(self)
-        msg_box_obj.setWindowTitle("Optimización Iniciada")
-        msg_box_obj.setText(f"✓ Optimización iniciada para {patient_name}\n\nRestarts: {restarts}\nPoblación: {pop_size}\nGeneraciones: {generations}\nDatos: {len(clinical_data)} puntos")
-        msg_box_obj.setIcon(QMessageBox.Information)
-        msg_box_obj.setStyleSheet("QMessageBox { background-color: white; } QLabel { background-color: white; }")
-        msg_box_obj.exec()
-        
-        print(f"✓ Optimización iniciada para {patient_name}")
-        print(f"  Restarts: {restarts}, Población: {pop_size}, Generaciones: {generations}")
-        print(f"  Datos: {len(clinical_data)} puntos")
+        self._show_info("Optimización Iniciada", f"✓ Optimización iniciada para {patient_name}\n\nRestarts: {restarts}\nPoblación: {pop_size}\nGeneraciones: {generations}\nDatos: {clinical_data.shape[0]} puntos")
+        
+        log.info("✓ Optimización iniciada para %s", patient_name)
+        log.info("  Restarts: %d, Población: %d, Generaciones: %d", restarts, pop_size, generations)
+        log.info("  Datos: %d puntos", clinical_data.shape[0])
     
+    @Slot(int)
     def _on_optimization_progress(self, progress):
         """Actualiza progreso"""
         self.sim_progress.setValue(progress)
     
+    @Slot(str)
     def _on_optimization_status(self, status_msg):
-        """Actualiza estado"""
-        print(f"  {status_msg}")
+        """Actualiza estado (solo visible con nivel DEBUG)"""
+        if log.isEnabledFor(logging.DEBUG):
+            log.debug("  %s", status_msg)
     
-    def _on_optimization_finished(self, solution, fitness, history):
+    @Slot(object, float, object, tuple)
+    def _on_optimization_finished(self, solution, fitness, history, rows):
         """Maneja fin de optimización"""
         self.start_btn.setEnabled(True)
         self.stop_btn.setEnabled(False)
         self.sim_progress.setValue(100)
         
+        # Escalar Python una sola vez (el GA puede devolver numpy.float64)
+        fitness = float(fitness)
+        error_val = -fitness
+        
         # Guardar referencia a datos de optimización para gráficas
         self.best_solution = solution
         self.best_fitness = fitness
         self.best_history = history
-        self.clinical_data_optimization = ClinicalDataHandler.get_clinical_data_from_table(self.tabla)
-        
-        # Mostrar resultados en tabla
-        self.results_table.setRowCount(0)
-        
-        # Agregar parámetros
-        params_to_show = [
-            'initLRATIO', 'TKI_effect', 'p_XY', 'p_YX', 'p_Y', 'K_Z', 'p_Z'
-        ]
-        
-        row = 0
-        for param in params_to_show:
-            if param in solution:
-                value = solution[param]
-                if param in ['p_XY', 'p_YX', 'K_Z', 'p_Z']:
-                    value_str = f"{value:.6e}"
-                else:
-                    value_str = f"{value:.6f}"
-                
-                self.results_table.insertRow(row)
-                item_param = QTableWidgetItem(param)
-                item_value = QTableWidgetItem(value_str)
-                self.results_table.setItem(row, 0, item_param)
-                self.results_table.setItem(row, 1, item_value)
-                row += 1
-        
-        # Agregar fitness
-        self.results_table.insertRow(row)
-        self.results_table.setItem(row, 0, QTableWidgetItem("Fitness"))
-        self.results_table.setItem(row, 1, QTableWidgetItem(f"{fitness:.6e}"))
-        row += 1
-        
-        # Agregar error
-        error_val = -fitness if fitness is not None else 0
-        self.results_table.insertRow(row)
-        self.results_table.setItem(row, 0, QTableWidgetItem("Error"))
-        self.results_table.setItem(row, 1, QTableWidgetItem(f"{error_val:.6e}"))
+        self.clinical_data_optimization = self._get_clinical_data()
+        
+        # Mostrar resultados en tabla: filas ya formateadas por el thread
+        self._set_results(rows)
         
         # Agregar botones de acciones
         self._add_action_buttons_to_results()
         
         # Mostrar mensaje de éxito
-        msg_box = QMessageBox(self)
-        msg_box.setWindowTitle("Optimización Completada")
-        msg_box.setText(f"✓ Optimización completada exitosamente\n\nFitness: {fitness:.6e}\nError: {error_val:.6e}\n\nPuedes ver las gráficas o guardar los resultados.")
-        msg_box.setIcon(QMessageBox.Information)
-        msg_box.setStyleSheet("QMessageBox { background-color: white; } QLabel { background-color: white; }")
-        msg_box.exec()
-        
-        print("✓ Optimización completada")
-        print(f"  Fitness: {fitness:.6e}")
+        self._show_info("Optimización Completada", f"✓ Optimización completada exitosamente\n\nFitness: {fitness:.6e}\nError: {error_val:.6e}\n\nPuedes ver las gráficas o guardar los resultados.")
+        
+        log.info("✓ Optimización completada")
+        log.info("  Fitness: %.6e", fitness)
+    
+    def _set_results(self, rows):
+        """Llena la tabla de resultados y mide la columna de nombres una sola vez"""
+        self.results_model.set_rows(rows)
+        self.results_table.resizeColumnToContents(0)
     
     def _add_action_buttons_to_results(self):
-        """Agrega botones de acciones visibles al lado de la barra de progreso"""
-        # Limpiar layout anterior
-        while self.actions_layout.count():
-            child = self.actions_layout.takeAt(0)
-            if child.widget():
-                child.widget().deleteLater()
-        
-        # Botón Ver Gráficas
-        btn_plots = QPushButton("Optimización")
-        btn_plots.setFixedHeight(28)
-        btn_plots.setMinimumWidth(110)
-        btn_plots.setStyleSheet("""
-            QPushButton {
-                background-color: #BBDEFB;
-                color: #1565C0;
-                border: none;
-                border-radius: 6px;
-                padding: 6px 12px;
-                font-weight: bold;
-                font-size: 12px;
-            }
-            QPushButton:hover {
-                background-color: #90CAF9;
-            }
-            QPushButton:pressed {
-                background-color: #64B5F6;
-            }
-        """)
-        btn_plots.clicked.connect(self._on_show_plots)
-        
-        # Botón Guardar JSON
-        btn_save = QPushButton("Guardar JSON")
-        btn_save.setFixedHeight(28)
-        btn_save.setMinimumWidth(110)
-        btn_save.setStyleSheet("""
-            QPushButton {
-                background-color: #C8E6C9;
-                color: #2E7D32;
-                border: none;
-                border-radius: 6px;
-                padding: 6px 12px;
-                font-weight: bold;
-                font-size: 12px;
-            }
-            QPushButton:hover {
-                background-color: #A5D6A7;
-            }
-            QPushButton:pressed {
-                background-color: #81C784;
-            }
-        """)
-        btn_save.clicked.connect(self._on_save_results)
-        
-        # Agregar botones al layout con stretch al inicio
-        self.actions_layout.insertStretch(0)
-        self.actions_layout.addWidget(btn_plots)
-        self.actions_layout.addWidget(btn_save)
-        
-        # Mostrar el widget de acciones
+        """Muestra los botones de acciones al lado de la barra de progreso"""
         self.actions_widget.setVisible(True)
     
+    @Slot()
     def _on_show_plots(self):
         """Muestra gráficas de optimización"""
         if hasattr(self, 'best_solution') and self.best_solution:
             try:
-                from ui.optimizer_core import plot_optimization_results
-                plot_optimization_results(self.best_solution, self.clinical_data_optimization)
+                _optimizer_core().plot_optimization_results(self.best_solution, self.clinical_data_optimization)
             except Exception as e:
-                msg_box = QMessageBox(self)
-                msg_box.setWindowTitle("Error al Mostrar Gráficas")
-                msg_box.setText(f"✗ Error: {str(e)}")
-                msg_box.setIcon(QMessageBox.Critical)
-                msg_box.setStyleSheet("QMessageBox { background-color: white; } QLabel { background-color: white; }")
-                msg_box.exec()
-                print(f"✗ Error al mostrar gráficas: {str(e)}")
+                self._show_error("Error al Mostrar Gráficas", f"✗ Error: {str(e)}")
+                log.error("✗ Error al mostrar gráficas: %s", e)
         else:
             self._show_warning_red("Advertencia", "⚠️ No hay resultados de optimización para mostrar gráficas.")
     
+    @Slot()
     def _on_save_results(self):
         """Guarda resultados con confirmación"""
         if hasattr(self, 'best_solution') and self.best_solution:
-            from ui.optimizer_core import save_optimization_results
             patient_name = self.patient_combo.currentText()
-            save_optimization_results(self.best_solution, self.best_fitness, patient_name)
+            _optimizer_core().save_optimization_results(self.best_solution, self.best_fitness, patient_name)
+            self._param_cache.pop(patient_name, None)
         else:
             self._show_warning_red("Advertencia", "⚠️ No hay resultados de optimización para guardar.")
     
+    @Slot(str)
     def _on_optimization_error(self, error_msg):
         """Maneja errores de optimización"""
         self.start_btn.setEnabled(True)
         self.stop_btn.setEnabled(False)
         self.sim_progress.setValue(0)
-        msg_box = QMessageBox(self)
-        msg_box.setWindowTitle("Error en Optimización")
-        msg_box.setText(f"✗ Error: {error_msg}")
-        msg_box.setIcon(QMessageBox.Critical)
-        msg_box.setStyleSheet("QMessageBox { background-color: white; } QLabel { background-color: white; }")
-        msg_box.exec()
-        print(f"✗ Error: {error_msg}")
+        self._show_error("Error en Optimización", f"✗ Error: {error_msg}")
+        log.error("✗ Error: %s", error_msg)
     
+    @Slot()
     def _on_start_optimization(self):
         """Inicia la optimización (botón)"""
         self._start_optimization()
     
+    @Slot()
     def _on_stop_optimization(self):
         """Cancela la optimización y espera a que termine"""
         # Desconectar la señal de progreso para evitar que emisiones
@@ -487,12 +564,11 @@ class MainWindow(QMainWindow):
         self.start_btn.setEnabled(True)
         self.stop_btn.setEnabled(False)
         self.sim_progress.setValue(0)
-        print("⊛ Optimización cancelada")
+        log.info("⊛ Optimización cancelada")
     
+    @Slot()
     def _on_projection_button_clicked(self):
         """Maneja proyección con estrategias"""
-        from ui.projection_scenarios import load_patient_parameters, plot_projection_with_strategies
-        
         patient_name = self.patient_combo.currentText()
         
         if not patient_name:
@@ -500,40 +576,31 @@ class MainWindow(QMainWindow):
             return
         
         # Verificar si existen parámetros guardados
-        params, error = load_patient_parameters(patient_name)
+        params, error = self._get_patient_params(patient_name)
         
         if not params:
             self._show_warning_red("Advertencia", f"⚠️ No se encontraron parámetros optimizados para {patient_name}.\n\nPor favor, ejecuta primero una optimización.")
             return
         
         # Obtener datos clínicos de la tabla
-        clinical_data = ClinicalDataHandler.get_clinical_data_from_table(self.tabla)
+        clinical_data = self._get_clinical_data()
         
-        if not clinical_data:
+        if clinical_data.size == 0:
             self._show_warning_red("Advertencia", "⚠️ No hay datos clínicos para proyectar.")
             return
         
-        # Obtener escenarios de la tabla de escenarios
-        scenarios_data = []
-        for row in range(self.scenarios_table.rowCount()):
-            mes_inicio_item = self.scenarios_table.item(row, 0)
-            mes_fin_item = self.scenarios_table.item(row, 2)  # Columna 2 es Fin
-            dosis_item = self.scenarios_table.item(row, 3)    # Columna 3 es Dosis
-            
-            if mes_inicio_item and mes_fin_item and dosis_item:
-                mes_inicio = int(mes_inicio_item.text())
-                mes_fin = int(mes_fin_item.text())
-                dosis_text = dosis_item.text().replace("%", "")
-                dosis = float(dosis_text)
-                scenarios_data.append((mes_inicio, mes_fin, dosis))
+        # Obtener escenarios de la tabla de escenarios (filas editadas a mano pueden no ser válidas)
+        invalid_rows = [str(r + 1) for r, values in enumerate(self.scenarios_model.values()) if values is None]
+        if invalid_rows:
+            self._show_warning_red("Advertencia", f"⚠️ Escenarios con valores no válidos (fila {', '.join(invalid_rows)}).\n\nCorrige Inicio, Duración, Fin y Dosis antes de proyectar.")
+            return
+        scenarios_data = self._scenarios_as_array()
         
         # Validar continuidad de escenarios (advertencia, no bloqueo)
-        if len(scenarios_data) > 1:
-            for i in range(1, len(scenarios_data)):
-                inicio_actual = scenarios_data[i][0]
-                fin_anterior = scenarios_data[i-1][1]
-                if inicio_actual != fin_anterior:
-                    print(f"⚠️ Advertencia: Discontinuidad en escenarios entre mes {fin_anterior} y {inicio_actual}")
+        for i in (scenarios_data[1:, 0] != scenarios_data[:-1, 1]).nonzero()[0]:
+            fin_anterior = int(scenarios_data[i, 1])
+            inicio_actual = int(scenarios_data[i + 1, 0])
+            log.warning("⚠️ Advertencia: Discontinuidad en escenarios entre mes %d y %d", fin_anterior, inicio_actual)
         
         # Determinar qué estrategias mostrar
         strategy_map = {
@@ -542,50 +609,40 @@ class MainWindow(QMainWindow):
         strategies = strategy_map.get(self.strategy_combo.currentIndex(), ['tapering'])
         
         # Mostrar gráficas pasando los escenarios
-        success, message = plot_projection_with_strategies(patient_name, clinical_data, strategies, scenarios_data=scenarios_data if scenarios_data else None)
+        success, message = _projection().plot_projection_with_strategies(patient_name, clinical_data, strategies, scenarios_data=scenarios_data if len(scenarios_data) else None)
         
         if success:
-            print(f"✓ Proyección mostrada para {patient_name}")
+            log.info("✓ Proyección mostrada para %s", patient_name)
         else:
-            msg_box = QMessageBox(self)
-            msg_box.setWindowTitle("Error al Mostrar Proyección")
-            msg_box.setText(f"✗ {message}")
-            msg_box.setIcon(QMessageBox.Critical)
-            msg_box.setStyleSheet("QMessageBox { background-color: white; } QLabel { background-color: white; }")
-            msg_box.exec()
+            self._show_error("Error al Mostrar Proyección", f"✗ {message}")
+    
+    def _scenarios_as_array(self):
+        """Escenarios de la tabla como arreglo (N, 3): [mes_inicio, mes_fin, dosis %]
+
+        Las filas no válidas (None en values(), p.ej. texto editado en la celda) se omiten.
+        """
+        import numpy as np
+        
+        # Columnas de la tabla: 0 Inicio, 2 Fin, 3 Dosis
+        values = [v for v in self.scenarios_model.values() if v is not None]
+        scenarios = np.empty((len(values), 3), dtype=np.float64)
+        for r, (inicio, _, fin, dosis) in enumerate(values):
+            scenarios[r] = (inicio, fin, dosis)
+        return scenarios
     
     # ========== PACIENTES ==========
     def _display_parameters_in_table(self, params, error):
         """Muestra parámetros optimizados en la tabla de resultados"""
-        self.results_table.setRowCount(0)
-        
-        # Agregar parámetros
-        params_to_show = [
-            'initLRATIO', 'TKI_effect', 'p_XY', 'p_YX', 'p_Y', 'K_Z', 'p_Z'
-        ]
-        
-        row = 0
-        for param in params_to_show:
-            if param in params:
-                value = params[param]
-                if param in ['p_XY', 'p_YX', 'K_Z', 'p_Z']:
-                    value_str = f"{value:.6e}"
-                else:
-                    value_str = f"{value:.6f}"
-                
-                self.results_table.insertRow(row)
-                item_param = QTableWidgetItem(param)
-                item_value = QTableWidgetItem(value_str)
-                self.results_table.setItem(row, 0, item_param)
-                self.results_table.setItem(row, 1, item_value)
-                row += 1
+        rows = format_param_rows(params)
         
         # Agregar error si existe
         if error is not None:
-            self.results_table.insertRow(row)
-            self.results_table.setItem(row, 0, QTableWidgetItem("Error"))
-            self.results_table.setItem(row, 1, QTableWidgetItem(f"{error:.6e}"))
+            error = float(error)
+            rows.append(("Error", f"{error:.6e}"))
+        
+        self._set_results(rows)
     
+    @Slot()
     def _on_show_optimization_plots(self):
         """Muestra gráficas de optimización del paciente actual"""
         patient_name = self.patient_combo.currentText()
@@ -594,92 +651,79 @@ class MainWindow(QMainWindow):
             self._show_warning_red("Advertencia", "⚠️ Por favor, selecciona un paciente.")
             return
         
-        from ui.projection_scenarios import load_patient_parameters
-        params, error = load_patient_parameters(patient_name)
+        params, error = self._get_patient_params(patient_name)
         
         if not params:
             self._show_warning_red("Advertencia", "⚠️ No hay parámetros optimizados para este paciente.")
             return
         
         # Obtener datos clínicos
-        clinical_data = ClinicalDataHandler.get_clinical_data_from_table(self.tabla)
+        clinical_data = self._get_clinical_data()
         
-        if not clinical_data:
+        if clinical_data.size == 0:
             self._show_warning_red("Advertencia", "⚠️ No hay datos clínicos para mostrar gráficas.")
             return
         
         try:
-            from ui.optimizer_core import plot_optimization_results
-            plot_optimization_results(params, clinical_data)
+            _optimizer_core().plot_optimization_results(params, clinical_data)
         except Exception as e:
-            msg_box = QMessageBox(self)
-            msg_box.setWindowTitle("Error al Mostrar Gráficas")
-            msg_box.setText(f"✗ Error: {str(e)}")
-            msg_box.setIcon(QMessageBox.Critical)
-            msg_box.setStyleSheet("QMessageBox { background-color: white; } QLabel { background-color: white; }")
-            msg_box.exec()
-            print(f"✗ Error al mostrar gráficas: {str(e)}")
+            self._show_error("Error al Mostrar Gráficas", f"✗ Error: {str(e)}")
+            log.error("✗ Error al mostrar gráficas: %s", e)
     
     # ========== PACIENTES ==========
+    @Slot(int)
     def _on_patient_selected(self, index):
+        """Reinicia el debounce; la carga real ocurre en _do_patient_selected"""
+        self._patient_debounce.start()
+    
+    @Slot()
+    def _do_patient_selected(self):
         """Carga datos del paciente seleccionado"""
-        from ui.projection_scenarios import load_patient_parameters
-        
         patient_name = self.patient_combo.currentText()
         
         # Si está vacío, limpiar datos
         if not patient_name:
-            self.tabla.setRowCount(0)
+            self.hist_model.set_rows([])
             self.patient_nombre.setText("Nombre: —")
             self.patient_edad.setText("Edad: —")
             self.patient_clave.setText("Clave: —")
             self.patient_sexo.setText("Sexo: —")
-            self.results_table.setRowCount(0)
+            self._set_results([])
             return
         
         # Cargar datos del paciente
         ClinicalDataHandler.load_patient_data(self.patient_combo, self.tabla)
         
-        # Datos de pacientes
-        patient_data = {
-                        "Paciente Manual": {'edad': '', 'clave': 'MANUAL', 'sexo': ''},
-            "Christopher Martin Jimenez Osorio": {'edad': '23', 'clave': '517259', 'sexo': 'Masculino'},
-            "Paciente Clase B (TFR Exitosa)": {'edad': '45', 'clave': 'CLASS-B', 'sexo': 'Femenino'},
-            "Paciente Clase A (Recurrencia)": {'edad': '52', 'clave': 'CLASS-A', 'sexo': 'Masculino'},
-            "Paciente Clase C (Recurrencia Tardía)": {'edad': '38', 'clave': 'CLASS-C', 'sexo': 'Femenino'},
-            "Paciente Manual": {'edad': '', 'clave': 'MANUAL', 'sexo': ''},
-        }
-        
-        data = patient_data.get(patient_name, {'edad': '—', 'clave': '—', 'sexo': '—'})
+        data = _PATIENT_DATA.get(patient_name, _UNKNOWN_PATIENT)
         self.patient_nombre.setText(f"Nombre: {patient_name}")
         self.patient_edad.setText(f"Edad: {data['edad']}")
         self.patient_clave.setText(f"Clave: {data['clave']}")
         self.patient_sexo.setText(f"Sexo: {data['sexo']}")
         
         # Cargar parámetros optimizados si existen
-        params, error = load_patient_parameters(patient_name)
+        params, error = self._get_patient_params(patient_name)
         if params:
             self._display_parameters_in_table(params, error)
         else:
-            self.results_table.setRowCount(0)
+            self._set_results([])
         
         # Actualizar mes inicio y recalcular escenarios
         self._update_mes_inicio_from_history()
     
     # ========== HISTORIAL ==========
+    @Slot()
     def _on_add_history_row(self):
         """Agrega fila al historial"""
-        from PySide6.QtWidgets import QTableWidgetItem
-        
-        # Deseleccionar fila actual
-        self.tabla.clearSelection()
+        # Deseleccionar fila actual (sin recargar sus valores en los campos)
+        with self._editing_table(self.tabla):
+            self.tabla.clearSelection()
         
         # Detectar último mes y auto-incrementar inteligentemente
         ultimo_mes = self._get_ultimo_mes_historial()
         
         # Si el campo mes no fue modificado manualmente, auto-incrementar
         mes_actual = int(self.mes_input.value())
-        if self.tabla.rowCount() > 0 and mes_actual <= ultimo_mes:
+        if self.hist_model.rowCount() > 0 and mes_actual <= ultimo_mes:
             # Detectar patrón común (3, 6, 12 meses)
             incremento = self._detectar_incremento_patron()
             mes = str(ultimo_mes + incremento)
@@ -694,11 +738,8 @@ class MainWindow(QMainWindow):
             self._show_warning_red("Campos Vacíos", "⚠️ Por favor, completa al menos un campo (Mes, Dosis o BCR-ABL%).")
             return
         
-        row = self.tabla.rowCount()
-        self.tabla.insertRow(row)
-        self.tabla.setItem(row, 0, QTableWidgetItem(mes))
-        self.tabla.setItem(row, 1, QTableWidgetItem(porc))
-        self.tabla.setItem(row, 2, QTableWidgetItem(dosis))
+        with self._editing_table(self.tabla):
+            self.hist_model.append_row((mes, porc, dosis))
         
         # Limpiar campos y preparar para siguiente registro
         self.mes_input.setValue(0)
@@ -707,32 +748,29 @@ class MainWindow(QMainWindow):
     
     def _detectar_incremento_patron(self):
         """Detecta el patrón de incremento común en el historial"""
-        if self.tabla.rowCount() < 2:
+        rows = self.hist_model.rows()
+        if len(rows) < 2:
             return 3  # Default: 3 meses
         
         # Calcular diferencias entre registros consecutivos
         diferencias = []
-        for row in range(1, self.tabla.rowCount()):
-            mes_actual_item = self.tabla.item(row, 0)
-            mes_prev_item = self.tabla.item(row - 1, 0)
-            if mes_actual_item and mes_prev_item:
-                try:
-                    dif = int(mes_actual_item.text()) - int(mes_prev_item.text())
-                    if dif > 0:
-                        diferencias.append(dif)
-                except ValueError:
-                    continue
+        for prev, actual in zip(rows, rows[1:]):
+            try:
+                dif = int(actual[0]) - int(prev[0])
+                if dif > 0:
+                    diferencias.append(dif)
+            except ValueError:
+                continue
         
         # Retornar el incremento más común, o 3 por defecto
         if diferencias:
             return max(set(diferencias), key=diferencias.count)
         return 3
     
+    @Slot()
     def _on_update_history_row(self):
         """Actualiza fila del historial"""
-        from PySide6.QtWidgets import QTableWidgetItem
-        
-        row = self.tabla.currentRow()
+        row = self.tabla.currentIndex().row()
         if row < 0:
             self._show_warning_red("Advertencia", "⚠️ Por favor, selecciona una fila para actualizar.")
             return
@@ -741,75 +779,76 @@ class MainWindow(QMainWindow):
         dosis = str(self.dosis_input.value())
         porc = str(self.porc_input.value())
         
-        self.tabla.setItem(row, 0, QTableWidgetItem(mes))
-        self.tabla.setItem(row, 1, QTableWidgetItem(porc))
-        self.tabla.setItem(row, 2, QTableWidgetItem(dosis))
+        with self._editing_table(self.tabla):
+            self.hist_model.set_row(row, (mes, porc, dosis))
     
+    @Slot()
     def _on_delete_history_row(self):
         """Elimina fila del historial"""
-        row = self.tabla.currentRow()
+        row = self.tabla.currentIndex().row()
         if row >= 0:
-            self.tabla.removeRow(row)
+            self.hist_model.remove_row(row)
         else:
             self._show_warning_red("Advertencia", "⚠️ Por favor, selecciona una fila para eliminar.")
     
+    @Slot()
+    def _forget_history_row(self, *args):
+        """El historial cambió: la próxima selección debe recargar los campos"""
+        self._hist_sel_row = -1
+    
+    @Slot()
     def _on_history_selection(self):
         """Carga datos de fila seleccionada en campos de entrada"""
-        row = self.tabla.currentRow()
-        if row < 0:
+        row = self.tabla.currentIndex().row()
+        # Moverse entre columnas de la misma fila no recarga los campos
+        if row < 0 or row == self._hist_sel_row:
             return
+        self._hist_sel_row = row
         
-        mes_item = self.tabla.item(row, 0)
-        porc_item = self.tabla.item(row, 1)
-        dosis_item = self.tabla.item(row, 2)
-        
-        if mes_item:
-            self.mes_input.setValue(int(mes_item.text()))
-        if porc_item:
-            self.porc_input.setValue(float(porc_item.text()))
-        if dosis_item:
-            self.dosis_input.setValue(float(dosis_item.text()))
+        values = self.hist_model.row_values(row)
+        if values is None:
+            return
+        mes, porc, dosis = values
+        with QSignalBlocker(self.mes_input), QSignalBlocker(self.porc_input), QSignalBlocker(self.dosis_input):
+            self.mes_input.setValue(mes)
+            # 'ND' (NaN) no tiene valor numérico que mostrar
+            if not math.isnan(porc):
+                self.porc_input.setValue(porc)
+            self.dosis_input.setValue(dosis)
     
     # ========== ESCENARIOS ==========
+    @Slot()
     def _on_add_scenario_row(self):
         """Agrega fila al tabla de escenarios"""
         duracion = int(self.duracion_spin.value())
         dosis = self.dosis_spin.value()
         
         # Determinar mes_inicio según lógica híbrida
-        if self.scenarios_table.rowCount() == 0:
+        rows = self.scenarios_model.rows()
+        if not rows:
             # Tabla vacía: usar mes_inicio_spin (puede ser desde historial o manual)
             mes_inicio = int(self.mes_inicio_spin.value())
         else:
             # Tabla con datos: verificar si mes_inicio_spin fue modificado manualmente
-            last_row = self.scenarios_table.rowCount() - 1
-            last_fin_item = self.scenarios_table.item(last_row, 2)
+            ultimo_fin = int(rows[-1][2])
+            mes_inicio_actual = int(self.mes_inicio_spin.value())
             
-            if last_fin_item:
-                ultimo_fin = int(last_fin_item.text())
-                mes_inicio_actual = int(self.mes_inicio_spin.value())
-                
-                # Si el usuario modificó mes_inicio_spin, respetar su valor
-                # De lo contrario, continuar desde el último fin
-                if mes_inicio_actual > ultimo_fin:
-                    mes_inicio = mes_inicio_actual
-                else:
-                    mes_inicio = ultimo_fin
+            # Si el usuario modificó mes_inicio_spin, respetar su valor
+            # De lo contrario, continuar desde el último fin
+            if mes_inicio_actual > ultimo_fin:
+                mes_inicio = mes_inicio_actual
             else:
-                mes_inicio = int(self.mes_inicio_spin.value())
+                mes_inicio = ultimo_fin
         
         mes_fin = mes_inicio + duracion
         
-        row = self.scenarios_table.rowCount()
-        self.scenarios_table.insertRow(row)
-        self.scenarios_table.setItem(row, 0, QTableWidgetItem(str(mes_inicio)))
-        self.scenarios_table.setItem(row, 1, QTableWidgetItem(str(duracion)))
-        self.scenarios_table.setItem(row, 2, QTableWidgetItem(str(mes_fin)))
-        self.scenarios_table.setItem(row, 3, QTableWidgetItem(f"{dosis}%"))
+        with self._editing_table(self.scenarios_table):
+            self.scenarios_model.append_row((str(mes_inicio), str(duracion), str(mes_fin), f"{dosis}%"))
     
+    @Slot()
     def _on_update_scenario_row(self):
         """Actualiza fila del tabla de escenarios"""
-        row = self.scenarios_table.currentRow()
+        row = self.scenarios_table.currentIndex().row()
         if row < 0:
             self._show_warning_red("Advertencia", "⚠️ Por favor, selecciona una fila para actualizar.")
             return
@@ -821,160 +860,86 @@ class MainWindow(QMainWindow):
         
         # Verificar discontinuidad o choque (advertencia, no bloqueo)
         if row > 0:
-            prev_fin_item = self.scenarios_table.item(row - 1, 2)
-            if prev_fin_item:
-                prev_fin = int(prev_fin_item.text())
-                if mes_inicio > prev_fin:
-                    print(f"⚠️ Advertencia: Hueco detectado entre mes {prev_fin} y {mes_inicio}")
-                elif mes_inicio < prev_fin:
-                    print(f"⚠️ Advertencia: Solapamiento detectado (inicio {mes_inicio} < fin anterior {prev_fin})")
+            prev_fin = int(self.scenarios_model.row(row - 1)[2])
+            if mes_inicio > prev_fin:
+                log.warning("⚠️ Advertencia: Hueco detectado entre mes %d y %d", prev_fin, mes_inicio)
+            elif mes_inicio < prev_fin:
+                log.warning("⚠️ Advertencia: Solapamiento detectado (inicio %d < fin anterior %d)", mes_inicio, prev_fin)
         
         # Actualizar inicio, duración, fin y dosis
-        self.scenarios_table.setItem(row, 0, QTableWidgetItem(str(mes_inicio)))
-        self.scenarios_table.setItem(row, 1, QTableWidgetItem(str(duracion)))
-        self.scenarios_table.setItem(row, 2, QTableWidgetItem(str(mes_fin)))
-        self.scenarios_table.setItem(row, 3, QTableWidgetItem(f"{dosis}%"))
+        with self._editing_table(self.scenarios_table):
+            self.scenarios_model.set_row(row, (str(mes_inicio), str(duracion), str(mes_fin), f"{dosis}%"))
     
+    @Slot()
     def _on_delete_scenario_row(self):
         """Elimina fila del tabla de escenarios"""
-        row = self.scenarios_table.currentRow()
+        row = self.scenarios_table.currentIndex().row()
         if row >= 0:
-            self.scenarios_table.removeRow(row)
+            self.scenarios_model.remove_row(row)
         else:
             self._show_warning_red("Advertencia", "⚠️ Por favor, selecciona una fila para eliminar.")
     
+    @Slot()
+    def _forget_scenario_row(self, *args):
+        """Los escenarios cambiaron: la próxima selección debe recargar los campos"""
+        self._scen_sel_row = -1
+    
+    @Slot()
     def _on_scenario_selection(self):
         """Carga datos de fila seleccionada de escenarios en campos de entrada"""
-        row = self.scenarios_table.currentRow()
-        if row < 0:
+        row = self.scenarios_table.currentIndex().row()
+        if row < 0 or row == self._scen_sel_row:
             return
+        self._scen_sel_row = row
         
-        inicio_item = self.scenarios_table.item(row, 0)
-        duracion_item = self.scenarios_table.item(row, 1)
-        dosis_item = self.scenarios_table.item(row, 3)
-        
-        if inicio_item:
-            self.mes_inicio_spin.setValue(int(inicio_item.text()))
-        
-        if duracion_item:
-            self.duracion_spin.setValue(int(duracion_item.text()))
-        
-        if dosis_item:
-            # Remover el símbolo % y convertir a float
-            dosis_text = dosis_item.text().replace("%", "")
-            self.dosis_spin.setValue(float(dosis_text))
+        values = self.scenarios_model.row_values(row)
+        if values is None:
+            return
+        inicio, duracion, _, dosis = values
+        # Señales bloqueadas: el mes fin se recalcula una sola vez al final
+        with QSignalBlocker(self.mes_inicio_spin), QSignalBlocker(self.duracion_spin), QSignalBlocker(self.dosis_spin):
+            self.mes_inicio_spin.setValue(inicio)
+            self.duracion_spin.setValue(duracion)
+            self.dosis_spin.setValue(dosis)
+        self._update_mes_fin()
     
+    @Slot()
     def _on_apply_strategy(self):
         """Aplica la estrategia seleccionada del combobox a la tabla de escenarios"""
         strategy_index = self.strategy_combo.currentIndex()
         strategy_name = self.strategy_combo.currentText()
         
         # Limpiar tabla actual
-        self.scenarios_table.setRowCount(0)
-        
-        # Definir escenarios según estrategia
-        scenarios = []
+        self.scenarios_model.set_rows([])
         
-        if strategy_index == 0:
-            # Opción vacía - no hacer nada
+        # Escenarios predefinidos: vacío y manual no agregan filas
+        if not 0 <= strategy_index < len(_STRATEGY_SCENARIOS):
             return
-        
-        elif strategy_index == 1:
-            # Manual - no hacer nada, usuario define
+        scenarios = _STRATEGY_SCENARIOS[strategy_index]
+        if not scenarios:
             return
         
-        elif strategy_index == 2:
-            # MR4+36M (Control - Dosis completa)
-            # 36 meses a dosis completa después de MR4
-            scenarios = [
-                (0, 36, 100.0),
-                (37, 120, 0.0)  # Suspensión
-            ]
-        
-        elif strategy_index == 3:
-            # MR4+24M+12M50% (DESTINY estándar)
-            # 24 meses completa + 12 meses al 50%
-            scenarios = [
-                (0, 24, 100.0),
-                (25, 36, 50.0),
-                (37, 120, 0.0)
-            ]
-        
-        elif strategy_index == 4:
-            # MR4+24M+12M25% (DESTINY 25%)
-            # 24 meses completa + 12 meses al 25%
-            scenarios = [
-                (0, 24, 100.0),
-                (25, 36, 25.0),
-                (37, 120, 0.0)
-            ]
-        
-        elif strategy_index == 5:
-            # MR4+12M+12M50%+12M25% (Escalonada - PROPUESTA NOVEDOSA)
-            # 12 meses completa + 12 al 50% + 12 al 25%
-            # Usa solo 58% de la droga total
-            scenarios = [
-                (0, 12, 100.0),
-                (13, 24, 50.0),
-                (25, 36, 25.0),
-                (37, 120, 0.0)
-            ]
-        
-        elif strategy_index == 6:
-            # MR4+12M+24M50% (Reducción prolongada)
-            # Solo 12 meses completa + 24 meses reducida
-            scenarios = [
-                (0, 12, 100.0),
-                (13, 36, 50.0),
-                (37, 120, 0.0)
-            ]
-        
-        elif strategy_index == 7:
-            # MR4+36M50% (Reducción inmediata 50%)
-            # Reducir al 50% inmediatamente después de MR4
-            scenarios = [
-                (0, 36, 50.0),
-                (37, 120, 0.0)
-            ]
-        
-        elif strategy_index == 8:
-            # MR4+36M25% (Reducción inmediata 25%)
-            # Reducir al 25% inmediatamente después de MR4
-            scenarios = [
-                (0, 36, 25.0),
-                (37, 120, 0.0)
-            ]
-        
         # Llenar tabla con escenarios (convertir a formato: inicio relativo, duración, fin calculado)
         ultimo_mes = self._get_ultimo_mes_historial()
+        rows = []
         for mes_inicio_rel, mes_fin_rel, dosis in scenarios:
             duracion = mes_fin_rel - mes_inicio_rel
             mes_inicio_abs = ultimo_mes + mes_inicio_rel
             mes_fin_abs = ultimo_mes + mes_fin_rel
-            
-            row = self.scenarios_table.rowCount()
-            self.scenarios_table.insertRow(row)
-            self.scenarios_table.setItem(row, 0, QTableWidgetItem(str(mes_inicio_abs)))
-            self.scenarios_table.setItem(row, 1, QTableWidgetItem(str(duracion)))
-            self.scenarios_table.setItem(row, 2, QTableWidgetItem(str(mes_fin_abs)))
-            self.scenarios_table.setItem(row, 3, QTableWidgetItem(f"{dosis}%"))
-        
-        print(f"✓ Estrategia aplicada: {strategy_name}")
+            rows.append((str(mes_inicio_abs), str(duracion), str(mes_fin_abs), f"{dosis}%"))
+        self.scenarios_model.set_rows(rows)
+        
+        log.info("✓ Estrategia aplicada: %s", strategy_name)
     
     def _get_ultimo_mes_historial(self):
         """Obtiene el último mes registrado en el historial de medicación"""
         max_mes = 0
-        for row in range(self.tabla.rowCount()):
-            mes_item = self.tabla.item(row, 0)
-            if mes_item:
-                try:
-                    mes = int(mes_item.text())
-                    if mes > max_mes:
-                        max_mes = mes
-                except ValueError:
-                    continue
+        for values in self.hist_model.values():
+            if values is not None and values[0] > max_mes:
+                max_mes = values[0]
         return max_mes
     
+    @Slot()
     def _update_mes_inicio_from_history(self):
         """Actualiza el mes de inicio automáticamente desde el historial"""
         ultimo_mes = self._get_ultimo_mes_historial()
@@ -982,10 +947,12 @@ class MainWindow(QMainWindow):
         self._update_mes_fin()
         self._recalcular_escenarios_tabla()
     
+    @Slot()
     def _on_duracion_changed(self):
         """Actualiza el mes fin cuando cambia la duración"""
         self._update_mes_fin()
     
+    @Slot()
     def _on_mes_inicio_changed(self):
         """Actualiza el mes fin cuando cambia el mes inicio"""
         self._update_mes_fin()
@@ -999,52 +966,55 @@ class MainWindow(QMainWindow):
     
     def _recalcular_escenarios_tabla(self):
         """Recalcula todos los valores de Inicio y Fin en la tabla manteniendo las duraciones"""
-        ultimo_mes = self._get_ultimo_mes_historial()
-        
-        for row in range(self.scenarios_table.rowCount()):
-            # Leer la duración (columna 1) que se mantiene constante
-            duracion_item = self.scenarios_table.item(row, 1)
-            if duracion_item:
-                duracion = int(duracion_item.text())
-                
-                # Calcular el inicio basado en el escenario anterior
-                if row == 0:
-                    mes_inicio = ultimo_mes
-                else:
-                    # El inicio es el fin del escenario anterior
-                    prev_fin_item = self.scenarios_table.item(row - 1, 2)
-                    if prev_fin_item:
-                        mes_inicio = int(prev_fin_item.text())
-                    else:
-                        mes_inicio = ultimo_mes
-                
-                # Calcular fin
-                mes_fin = mes_inicio + duracion
-                
-                # Actualizar celdas de Inicio (col 0) y Fin (col 2)
-                self.scenarios_table.setItem(row, 0, QTableWidgetItem(str(mes_inicio)))
-                self.scenarios_table.setItem(row, 2, QTableWidgetItem(str(mes_fin)))
+        # El inicio de cada escenario es el fin del anterior (el primero parte del historial)
+        mes_inicio = self._get_ultimo_mes_historial()
+        
+        rows = []
+        for row, values in zip(self.scenarios_model.rows(), self.scenarios_model.values()):
+            if values is None:
+                # Fila no válida (editada a mano): se deja tal cual
+                rows.append(row)
+                continue
+            # La duración (columna 1) se mantiene constante
+            _, duracion_text, _, dosis_text = row
+            mes_fin = mes_inicio + values[1]
+            rows.append((str(mes_inicio), duracion_text, str(mes_fin), dosis_text))
+            mes_inicio = mes_fin
+        
+        # Actualizar Inicio (col 0) y Fin (col 2) con un solo dataChanged
+        self.scenarios_model.update_rows(rows)
     
     def _recalcular_filas_posteriores(self, desde_fila):
         """Recalcula las filas posteriores a la fila especificada para mantener continuidad"""
-        for row in range(desde_fila + 1, self.scenarios_table.rowCount()):
-            duracion_item = self.scenarios_table.item(row, 1)
-            if duracion_item:
-                duracion = int(duracion_item.text())
-                
-                # El inicio es el fin del escenario anterior
-                prev_fin_item = self.scenarios_table.item(row - 1, 2)
-                if prev_fin_item:
-                    mes_inicio = int(prev_fin_item.text())
-                    mes_fin = mes_inicio + duracion
-                    
-                    # Actualizar Inicio y Fin
-                    self.scenarios_table.setItem(row, 0, QTableWidgetItem(str(mes_inicio)))
-                    self.scenarios_table.setItem(row, 2, QTableWidgetItem(str(mes_fin)))
+        rows = self.scenarios_model.rows()
+        for row in range(desde_fila + 1, len(rows)):
+            # El inicio es el fin del escenario anterior
+            mes_inicio = int(rows[row - 1][2])
+            mes_fin = mes_inicio + int(rows[row][1])
+            
+            # Actualizar Inicio y Fin
+            _, duracion_text, _, dosis_text = rows[row]
+            self.scenarios_model.set_row(row, (str(mes_inicio), duracion_text, str(mes_fin), dosis_text))
+
+
+def _start_log_listener():
+    """Encola los registros y los escribe a consola desde un hilo aparte
+
+    Así el hilo de la GUI solo agrega a una cola; el write/flush a stderr
+    (posiblemente una tubería) ocurre en el hilo del QueueListener.
+    """
+    records = queue.SimpleQueue()
+    listener = logging.handlers.QueueListener(records, logging.StreamHandler())
+    logging.basicConfig(level=logging.INFO, format="%(message)s",
+                        handlers=[logging.handlers.QueueHandler(records)])
+    listener.start()
+    return listener
 
 
 if __name__ == "__main__":
+    log_listener = _start_log_listener()
     app = QApplication(sys.argv)
+    app.aboutToQuit.connect(log_listener.stop)
     window = MainWindow()
     window.show()
     sys.exit(app.exec())
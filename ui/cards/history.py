@@ -1,7 +1,10 @@
-from PySide6.QtWidgets import QFrame, QVBoxLayout, QWidget, QHBoxLayout, QLineEdit, QPushButton, QTableWidget, QTableWidgetItem, QHeaderView, QLabel, QProgressBar, QDialog, QTextEdit, QListWidget, QListWidgetItem, QSpinBox, QDoubleSpinBox
+from PySide6.QtWidgets import QFrame, QVBoxLayout, QWidget, QHBoxLayout, QLineEdit, QPushButton, QTableView, QHeaderView, QLabel, QProgressBar, QDialog, QTextEdit, QListWidget, QListWidgetItem, QSpinBox, QDoubleSpinBox
 from PySide6.QtCore import Qt
 from PySide6.QtGui import QColor
 
+from ui.helpers import create_field_label
+from ui.table_models import HistoryTableModel
+
 def create_history_card():
     card = QFrame()
     card.setObjectName('card')
@@ -9,7 +12,7 @@ def create_history_card():
     card_layout.setContentsMargins(8, 4, 8, 4)
     title = QLabel("Historial de medicación")
     title.setAlignment(Qt.AlignCenter)
-    title.setStyleSheet("font-weight: normal; font-size: 14px; color: #07210F; margin: 0px; padding: 0px;")
+    title.setObjectName("card_title")
     card_layout.addWidget(title)
 
     # Spinners para mes
@@ -20,41 +23,6 @@ def create_history_card():
     mes_input.setFixedHeight(28)
     mes_input.setMaximumWidth(100)
     mes_input.setButtonSymbols(QSpinBox.UpDownArrows)
-    mes_input.setStyleSheet("""
-        QSpinBox {
-            background-color: white;
-            color: #333;
-            border: 1px solid #ccc;
-            border-radius: 4px;
-            padding: 2px 2px 2px 4px;
-        }
-        QSpinBox::up-button {
-            background-color: #A5D6A7;
-            border: none;
-            border-radius: 2px;
-            width: 16px;
-            margin: 0px;
-        }
-        QSpinBox::down-button {
-            background-color: #A5D6A7;
-            border: none;
-            border-radius: 2px;
-            width: 16px;
-            margin: 0px;
-        }
-        QSpinBox::up-button:hover {
-            background-color: #81C784;
-        }
-        QSpinBox::up-button:pressed {
-            background-color: #66BB6A;
-        }
-        QSpinBox::down-button:hover {
-            background-color: #81C784;
-        }
-        QSpinBox::down-button:pressed {
-            background-color: #66BB6A;
-        }
-    """)
     
     # DoubleSpinBox para BCR-ABL%
     porc_input = QDoubleSpinBox()
@@ -66,41 +34,6 @@ def create_history_card():
     porc_input.setFixedHeight(28)
     porc_input.setMaximumWidth(100)
     porc_input.setButtonSymbols(QDoubleSpinBox.UpDownArrows)
-    porc_input.setStyleSheet("""
-        QDoubleSpinBox {
-            background-color: white;
-            color: #333;
-            border: 1px solid #ccc;
-            border-radius: 4px;
-            padding: 2px 2px 2px 4px;
-        }
-        QDoubleSpinBox::up-button {
-            background-color: #A5D6A7;
-            border: none;
-            border-radius: 2px;
-            width: 16px;
-            margin: 0px;
-        }
-        QDoubleSpinBox::down-button {
-            background-color: #A5D6A7;
-            border: none;
-            border-radius: 2px;
-            width: 16px;
-            margin: 0px;
-        }
-        QDoubleSpinBox::up-button:hover {
-            background-color: #81C784;
-        }
-        QDoubleSpinBox::up-button:pressed {
-            background-color: #66BB6A;
-        }
-        QDoubleSpinBox::down-button:hover {
-            background-color: #81C784;
-        }
-        QDoubleSpinBox::down-button:pressed {
-            background-color: #66BB6A;
-        }
-    """)
     
     # DoubleSpinBox para Dosis
     dosis_input = QDoubleSpinBox()
@@ -112,101 +45,16 @@ def create_history_card():
     dosis_input.setFixedHeight(28)
     dosis_input.setMaximumWidth(100)
     dosis_input.setButtonSymbols(QDoubleSpinBox.UpDownArrows)
-    dosis_input.setStyleSheet("""
-        QDoubleSpinBox {
-            background-color: white;
-            color: #333;
-            border: 1px solid #ccc;
-            border-radius: 4px;
-            padding: 2px 2px 2px 4px;
-        }
-        QDoubleSpinBox::up-button {
-            background-color: #A5D6A7;
-            border: none;
-            border-radius: 2px;
-            width: 16px;
-            margin: 0px;
-        }
-        QDoubleSpinBox::down-button {
-            background-color: #A5D6A7;
-            border: none;
-            border-radius: 2px;
-            width: 16px;
-            margin: 0px;
-        }
-        QDoubleSpinBox::up-button:hover {
-            background-color: #81C784;
-        }
-        QDoubleSpinBox::up-button:pressed {
-            background-color: #66BB6A;
-        }
-        QDoubleSpinBox::down-button:hover {
-            background-color: #81C784;
-        }
-        QDoubleSpinBox::down-button:pressed {
-            background-color: #66BB6A;
-        }
-    """)
 
     # Botones para agregar/editar/borrar
     add_btn = QPushButton("Agregar")
     edit_btn = QPushButton("Actualizar")
     del_btn = QPushButton("Borrar")
     
-    # Establecer colores pastel
-    add_btn.setStyleSheet("""
-        QPushButton {
-            background-color: #C8E6C9;
-            color: #2E7D32;
-            border: none;
-            border-radius: 6px;
-            padding: 6px 12px;
-            font-weight: bold;
-            font-size: 12px;
-        }
-        QPushButton:hover {
-            background-color: #A5D6A7;
-        }
-        QPushButton:pressed {
-            background-color: #81C784;
-        }
-    """)
-    
-    edit_btn.setStyleSheet("""
-        QPushButton {
-            background-color: #BBDEFB;
-            color: #1565C0;
-            border: none;
-            border-radius: 6px;
-            padding: 6px 12px;
-            font-weight: bold;
-            font-size: 12px;
-        }
-        QPushButton:hover {
-            background-color: #90CAF9;
-        }
-        QPushButton:pressed {
-            background-color: #64B5F6;
-        }
-    """)
-    
-    del_btn.setStyleSheet("""
-        QPushButton {
-            background-color: #FFCCCC;
-            color: #C62828;
-            border: none;
-            border-radius: 6px;
-            padding: 6px 12px;
-            font-weight: bold;
-            font-size: 12px;
-        }
-        QPushButton:hover {
-            background-color: #EF9A9A;
-        }
-        QPushButton:pressed {
-            background-color: #E57373;
-        }
-    """)
+    # Colores pastel definidos en STYLES (por objectName)
+    add_btn.setObjectName("hist_add_btn")
+    edit_btn.setObjectName("hist_update_btn")
+    del_btn.setObjectName("hist_del_btn")
     
     add_btn.setFixedHeight(32)
     edit_btn.setFixedHeight(32)
@@ -216,27 +64,17 @@ def create_history_card():
     del_btn.setMaximumWidth(120)
     
     # Tabla del historial (3 columnas) - izquierda
-    tabla = QTableWidget(0, 3)
-    tabla.setHorizontalHeaderLabels(["Mes", "BCR-ABL%", "Dosis"])
-    tabla.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+    tabla = QTableView()
+    tabla.setModel(HistoryTableModel(tabla))
+    # Anchos fijos y solo la última columna estirada (sin recálculo de todas al insertar)
+    header = tabla.horizontalHeader()
+    header.setSectionResizeMode(QHeaderView.Interactive)
+    header.setStretchLastSection(True)
+    tabla.setColumnWidth(0, 80)
+    tabla.setColumnWidth(1, 120)
     tabla.setObjectName("history_table")
     tabla.verticalHeader().setVisible(False)
     tabla.verticalHeader().setDefaultSectionSize(28)
-    tabla.setStyleSheet("""
-        QTableWidget {
-            border: none;
-        }
-        QTableWidget::item {
-            border-right: none;
-        }
-        QHeaderView::section {
-            background-color: #C8E6C9;
-            color: #2E7D32;
-            padding: 6px;
-            border: none;
-            font-weight: bold;
-        }
-    """)
     tabla.setMinimumHeight(300)
     tabla.setMaximumHeight(400)
 
@@ -250,8 +88,7 @@ def create_history_card():
     row1 = QVBoxLayout()
     row1.setContentsMargins(0, 0, 0, 0)
     row1.setSpacing(2)
-    lbl1 = QLabel("Mes:")
-    lbl1.setStyleSheet("font-size: 12px;")
+    lbl1 = create_field_label("Mes:")
     row1.addWidget(lbl1, 0)
     row1.addWidget(mes_input, 0)
     
@@ -259,8 +96,7 @@ def create_history_card():
     row2 = QVBoxLayout()
     row2.setContentsMargins(0, 0, 0, 0)
     row2.setSpacing(2)
-    lbl2 = QLabel("BCR-ABL%:")
-    lbl2.setStyleSheet("font-size: 12px;")
+    lbl2 = create_field_label("BCR-ABL%:")
     row2.addWidget(lbl2, 0)
     row2.addWidget(porc_input, 0)
     
@@ -268,8 +104,7 @@ def create_history_card():
     row3 = QVBoxLayout()
     row3.setContentsMargins(0, 0, 0, 0)
     row3.setSpacing(2)
-    lbl3 = QLabel("Dosis:")
-    lbl3.setStyleSheet("font-size: 12px;")
+    lbl3 = create_field_label("Dosis:")
     row3.addWidget(lbl3, 0)
     row3.addWidget(dosis_input, 0)
     
@@ -15,7 +15,7 @@ def create_patient_card():
     photo_label = QLabel("Foto")
     photo_label.setFixedSize(120, 120)
     photo_label.setAlignment(Qt.AlignCenter)
-    photo_label.setStyleSheet("background-color: #EDF9EE; border: 1px solid #CDE7D2; border-radius:8px; color:#07210F;")
+    photo_label.setObjectName("patient_photo")
 
     info_column = QWidget()
     info_col_layout = QVBoxLayout(info_column)
@@ -26,11 +26,11 @@ def create_patient_card():
     patient_edad = QLabel("Edad: —")
     patient_sexo = QLabel("Sexo: —")
     patient_clave = QLabel("Clave: —")
-    patient_style = "background-color: #F2FAF2; color: #07210F; padding:6px; border-radius:6px;"
-    patient_nombre.setStyleSheet(patient_style)
-    patient_edad.setStyleSheet(patient_style)
-    patient_sexo.setStyleSheet(patient_style)
-    patient_clave.setStyleSheet(patient_style)
+    # Estilo común en STYLES (por objectName)
+    patient_nombre.setObjectName("patient_nombre")
+    patient_edad.setObjectName("patient_edad")
+    patient_sexo.setObjectName("patient_sexo")
+    patient_clave.setObjectName("patient_clave")
 
     info_col_layout.addWidget(patient_nombre)
     info_col_layout.addWidget(patient_edad)
@@ -42,7 +42,7 @@ def create_patient_card():
 
     title_card3 = QLabel("Datos del paciente")
     title_card3.setAlignment(Qt.AlignCenter)
-    title_card3.setStyleSheet("font-weight: normal; font-size: 14px; color: #07210F;")
+    title_card3.setObjectName("card_title")
     card3_layout.addWidget(title_card3)
 
     select_row = QWidget()
@@ -52,37 +52,8 @@ def create_patient_card():
     select_label = QLabel("Seleccionar paciente:")
     patient_combo = QComboBox()
     patient_combo.setFixedHeight(24)
-    patient_combo.setStyleSheet("""
-        QComboBox {
-            background-color: #C8E6C9;
-            color: #000000;
-            border: 1px solid #A5D6A7;
-            border-radius: 6px;
-            padding: 2px 4px;
-            font-size: 12px;
-        }
-        QComboBox::drop-down {
-            border: none;
-            width: 20px;
-        }
-        QComboBox::down-arrow {
-            image: none;
-            width: 0px;
-        }
-        QComboBox QAbstractItemView {
-            background-color: #FFFFFF;
-            color: #000000;
-            selection-background-color: #78C08F;
-            border: 1px solid #A5D6A7;
-        }
-    """)
-    # Agregar pacientes (sin pre-seleccionar)
-    patient_combo.addItem("")  # Item vacío por defecto
-    patient_combo.addItem("Christopher Martin Jimenez Osorio")
-    patient_combo.addItem("Paciente Clase B (TFR Exitosa)")
-    patient_combo.addItem("Paciente Clase A (Recurrencia)")
-    patient_combo.addItem("Paciente Clase C (Recurrencia Tardía)")
-    patient_combo.addItem("Paciente Manual")
+    patient_combo.setObjectName("patient_combo")
+    # Los pacientes se agregan tras el primer frame (MainWindow._populate_patient_list)
     select_row_layout.addWidget(select_label)
     select_row_layout.addStretch()
     select_row_layout.addWidget(patient_combo, 1)
@@ -1,9 +1,22 @@
+from functools import partial
+
 from PySide6.QtWidgets import (
     QFrame, QVBoxLayout, QWidget, QHBoxLayout, QPushButton, 
-    QProgressBar, QLabel, QTableWidget, QHeaderView, QSpinBox
+    QProgressBar, QLabel, QTableView, QHeaderView, QSpinBox
 )
 from PySide6.QtCore import Qt
 
+from ui.table_models import ResultsTableModel
+
+
+def _switch_view(active_btn, inactive_btn, show_view, hide_view, checked=False):
+    """Marca la pestaña activa y muestra su vista (ocultando la otra)"""
+    active_btn.setChecked(True)
+    inactive_btn.setChecked(False)
+    show_view.setVisible(True)
+    hide_view.setVisible(False)
+
+
 def create_projection_card():
     """Crea card de proyección con botones para cambiar entre Optimizar y Proyectar"""
     card4 = QFrame()
@@ -23,31 +36,13 @@ def create_projection_card():
     btn_optimize.setChecked(True)
     btn_optimize.setCursor(Qt.PointingHandCursor)
     btn_optimize.setMinimumWidth(120)
-    btn_optimize.setStyleSheet("""
-        QPushButton {
-            background-color: transparent;
-            color: #9E9E9E;
-            border: none;
-            border-bottom: 3px solid transparent;
-            padding: 8px 12px;
-            font-size: 15px;
-            font-weight: normal;
-        }
-        QPushButton:checked {
-            color: #2E7D32;
-            border-bottom: 3px solid #4CAF50;
-            font-weight: bold;
-        }
-        QPushButton:hover:!checked {
-            color: #616161;
-        }
-    """)
+    btn_optimize.setObjectName("tab_btn")
     
     btn_project = QPushButton("Proyectar")
     btn_project.setCheckable(True)
     btn_project.setCursor(Qt.PointingHandCursor)
     btn_project.setMinimumWidth(120)
-    btn_project.setStyleSheet(btn_optimize.styleSheet())
+    btn_project.setObjectName("tab_btn")
     
     nav_layout.addWidget(btn_optimize)
     nav_layout.addWidget(btn_project)
@@ -76,41 +71,7 @@ def create_projection_card():
     restarts_spin.setValue(3)
     restarts_spin.setFixedSize(80, 28)  # Tamaño fijo completo
     restarts_spin.setButtonSymbols(QSpinBox.UpDownArrows)
-    restarts_spin.setStyleSheet("""
-        QSpinBox {
-            background-color: white;
-            color: #333;
-            border: 1px solid #ccc;
-            border-radius: 4px;
-            padding: 2px 2px 2px 4px;
-        }
-        QSpinBox::up-button {
-            background-color: #d0d0d0;
-            border: none;
-            border-radius: 2px;
-            width: 16px;
-            margin: 0px;
-        }
-        QSpinBox::down-button {
-            background-color: #d0d0d0;
-            border: none;
-            border-radius: 2px;
-            width: 16px;
-            margin: 0px;
-        }
-        QSpinBox::up-button:hover {
-            background-color: #b0b0b0;
-        }
-        QSpinBox::up-button:pressed {
-            background-color: #909090;
-        }
-        QSpinBox::down-button:hover {
-            background-color: #b0b0b0;
-        }
-        QSpinBox::down-button:pressed {
-            background-color: #909090;
-        }
-    """)
+    restarts_spin.setObjectName("ga_spin")
     
     # Población
     pop_spin = QSpinBox()
@@ -119,7 +80,7 @@ def create_projection_card():
     pop_spin.setValue(60)
     pop_spin.setFixedSize(80, 28)  # Tamaño fijo completo
     pop_spin.setButtonSymbols(QSpinBox.UpDownArrows)
-    pop_spin.setStyleSheet(restarts_spin.styleSheet())
+    pop_spin.setObjectName("ga_spin")
     
     # Generaciones
     gens_spin = QSpinBox()
@@ -128,7 +89,7 @@ def create_projection_card():
     gens_spin.setValue(80)
     gens_spin.setFixedSize(80, 28)  # Tamaño fijo completo
     gens_spin.setButtonSymbols(QSpinBox.UpDownArrows)
-    gens_spin.setStyleSheet(restarts_spin.styleSheet())
+    gens_spin.setObjectName("ga_spin")
     
     params_layout.addWidget(QLabel("Restarts:"))
     params_layout.addWidget(restarts_spin)
@@ -148,47 +109,12 @@ def create_projection_card():
     
     start_btn = QPushButton("▶ Iniciar")
     start_btn.setFixedHeight(28)
-    start_btn.setStyleSheet("""
-        QPushButton {
-            background-color: #C8E6C9;
-            color: #2E7D32;
-            border: none;
-            border-radius: 6px;
-            padding: 6px 12px;
-            font-weight: bold;
-        }
-        QPushButton:hover {
-            background-color: #A5D6A7;
-        }
-        QPushButton:pressed {
-            background-color: #81C784;
-        }
-    """)
+    start_btn.setObjectName("start_btn")
     
     stop_btn = QPushButton("✖ Cancelar")
     stop_btn.setEnabled(False)
     stop_btn.setFixedHeight(28)
-    stop_btn.setStyleSheet("""
-        QPushButton {
-            background-color: #FFCDD2;
-            color: #C62828;
-            border: none;
-            border-radius: 6px;
-            padding: 6px 12px;
-            font-weight: bold;
-            font-size: 12px;
-        }
-        QPushButton:hover:enabled {
-            background-color: #EF9A9A;
-        }
-        QPushButton:pressed:enabled {
-            background-color: #E57373;
-        }
-        QPushButton:disabled {
-            background-color: #F0F0F0;
-            color: #AAAAAA;
-        }
-    """)
+    stop_btn.setObjectName("stop_btn")
 
     # El manejo de cancelar/stop lo realiza la ventana principal (`MainWindow`)
     # para controlar correctamente el `OptimizationThread` y el estado global.
@@ -204,19 +130,7 @@ def create_projection_card():
     proj_progress = QProgressBar()
     proj_progress.setFixedHeight(20)
     proj_progress.setValue(0)
-    proj_progress.setStyleSheet("""
-        QProgressBar {
-            border: 1px solid #E0E0E0;
-            border-radius: 4px;
-            background-color: #F5F5F5;
-            text-align: center;
-            font-size: 11px;
-        }
-        QProgressBar::chunk {
-            background-color: #4CAF50;
-            border-radius: 3px;
-        }
-    """)
+    proj_progress.setObjectName("proj_progress")
     
     view_optimize_layout.addWidget(proj_progress)
     
@@ -227,6 +141,21 @@ def create_projection_card():
     actions_layout.setContentsMargins(0, 6, 0, 0)
     actions_layout.setSpacing(6)
     
+    # Se crean una sola vez; el estilo vive en STYLES (por objectName)
+    plots_btn = QPushButton("Optimización")
+    plots_btn.setObjectName("plots_btn")
+    plots_btn.setFixedHeight(28)
+    plots_btn.setMinimumWidth(110)
+    
+    save_btn = QPushButton("Guardar JSON")
+    save_btn.setObjectName("save_btn")
+    save_btn.setFixedHeight(28)
+    save_btn.setMinimumWidth(110)
+    
+    actions_layout.addStretch()
+    actions_layout.addWidget(plots_btn)
+    actions_layout.addWidget(save_btn)
+    
     view_optimize_layout.addWidget(actions_widget)
     view_optimize_layout.addStretch()
     
@@ -247,41 +176,11 @@ def create_projection_card():
     
     project_btn = QPushButton("Proyectar")
     project_btn.setFixedHeight(28)
-    project_btn.setStyleSheet("""
-        QPushButton {
-            background-color: #FFE082;
-            color: #F57C00;
-            border: none;
-            border-radius: 6px;
-            padding: 6px 12px;
-            font-weight: bold;
-        }
-        QPushButton:hover {
-            background-color: #FFD54F;
-        }
-        QPushButton:pressed {
-            background-color: #FFC107;
-        }
-    """)
+    project_btn.setObjectName("project_btn")
     
     plot_opt_btn = QPushButton("Ver Gráficas")
     plot_opt_btn.setFixedHeight(28)
-    plot_opt_btn.setStyleSheet("""
-        QPushButton {
-            background-color: #BBDEFB;
-            color: #1565C0;
-            border: none;
-            border-radius: 6px;
-            padding: 6px 12px;
-            font-weight: bold;
-        }
-        QPushButton:hover {
-            background-color: #90CAF9;
-        }
-        QPushButton:pressed {
-            background-color: #64B5F6;
-        }
-    """)
+    plot_opt_btn.setObjectName("plot_opt_btn")
     
     proj_buttons_layout.addWidget(project_btn)
     proj_buttons_layout.addWidget(plot_opt_btn)
@@ -290,46 +189,23 @@ def create_projection_card():
     view_project_layout.addWidget(proj_buttons)
     view_project_layout.addStretch()
     
-    # Conectar botones usando lambda para evitar funciones anidadas
-    btn_optimize.clicked.connect(lambda: (
-        btn_optimize.setChecked(True),
-        btn_project.setChecked(False),
-        view_optimize.setVisible(True),
-        view_project.setVisible(False)
-    ))
-    
-    btn_project.clicked.connect(lambda: (
-        btn_optimize.setChecked(False),
-        btn_project.setChecked(True),
-        view_optimize.setVisible(False),
-        view_project.setVisible(True)
-    ))
+    # Conectar botones con partial sobre una función de módulo (sin closures)
+    btn_optimize.clicked.connect(
+        partial(_switch_view, btn_optimize, btn_project, view_optimize, view_project)
+    )
+    btn_project.clicked.connect(
+        partial(_switch_view, btn_project, btn_optimize, view_project, view_optimize)
+    )
     
     # Tabla de resultados
-    results_table = QTableWidget(0, 2)
-    results_table.setHorizontalHeaderLabels(["Parámetro", "Valor"])
-    results_table.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeToContents)
+    results_table = QTableView()
+    results_table.setModel(ResultsTableModel(results_table))
+    # Columna 0 Interactive: MainWindow la ajusta al contenido una vez por llenado
+    results_table.horizontalHeader().setSectionResizeMode(0, QHeaderView.Interactive)
     results_table.horizontalHeader().setSectionResizeMode(1, QHeaderView.Stretch)
     results_table.setObjectName("results_table")
     results_table.verticalHeader().setVisible(False)
     results_table.verticalHeader().setDefaultSectionSize(28)
-    results_table.setStyleSheet("""
-        QTableWidget {
-            border: none;
-        }
-        QTableWidget::item {
-            padding: 4px;
-            border-bottom: 1px solid #F0F0F0;
-            border-right: none;
-        }
-        QHeaderView::section {
-            background-color: #C8E6C9;
-            padding: 4px;
-            border: none;
-            font-weight: bold;
-            color: #000000;
-        }
-    """)
     card4_layout.addWidget(results_table, 1)
 
     # Exportar widgets
@@ -349,6 +225,8 @@ def create_projection_card():
         'plot_opt_btn': plot_opt_btn,
         'actions_widget': actions_widget,
         'actions_layout': actions_layout,
+        'plots_btn': plots_btn,
+        'save_btn': save_btn,
     }
 
     return card4, widgets
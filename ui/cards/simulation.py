@@ -1,6 +1,8 @@
-from PySide6.QtWidgets import QFrame, QVBoxLayout, QWidget, QHBoxLayout, QComboBox, QTableWidget, QHeaderView, QLabel
+from PySide6.QtWidgets import QFrame, QVBoxLayout, QWidget, QHBoxLayout, QComboBox, QTableView, QHeaderView, QLabel
 from PySide6.QtCore import Qt
 
+from ui.table_models import ResultsTableModel
+
 def create_simulation_card():
     card2 = QFrame()
     card2.setObjectName("card")
@@ -17,32 +19,7 @@ def create_simulation_card():
     combo_sim = QComboBox()
     combo_sim.addItem("Simulación")
     combo_sim.setFixedHeight(24)
-    combo_sim.setStyleSheet("""
-        QComboBox {
-            background-color: #C8E6C9;
-            color: #000000;
-            border: 1px solid #A5D6A7;
-            border-radius: 6px;
-            padding: 2px 4px;
-            font-size: 12px;
-        }
-        QComboBox::drop-down {
-            border: none;
-            width: 20px;
-            border-radius: 4px;
-        }
-        QComboBox::down-arrow {
-            image: none;
-            width: 0px;
-        }
-        QComboBox QAbstractItemView {
-            background-color: #FFFFFF;
-            color: #000000;
-            selection-background-color: #78C08F;
-            border: 1px solid #A5D6A7;
-            border-radius: 6px;
-        }
-    """)
+    combo_sim.setObjectName("combo_sim")
     
     controls_layout.addWidget(QLabel("Escenario:"))
     controls_layout.addWidget(combo_sim, 1)
@@ -50,10 +27,12 @@ def create_simulation_card():
     card2_layout.addWidget(controls)
 
     # Tabla para mostrar datos del escenario
-    scenarios_table = QTableWidget(0, 2)
-    scenarios_table.setHorizontalHeaderLabels(["Parámetro", "Valor"])
-    scenarios_table.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeToContents)
+    scenarios_table = QTableView()
+    scenarios_table.setModel(ResultsTableModel(scenarios_table))
+    # Ancho fijo para los nombres (sin medir cada celda); el valor ocupa el resto
+    scenarios_table.horizontalHeader().setSectionResizeMode(0, QHeaderView.Interactive)
     scenarios_table.horizontalHeader().setSectionResizeMode(1, QHeaderView.Stretch)
+    scenarios_table.setColumnWidth(0, 120)
     scenarios_table.setObjectName("scenarios_table")
     scenarios_table.verticalHeader().setVisible(False)
     scenarios_table.verticalHeader().setDefaultSectionSize(28)
@@ -1,21 +1,46 @@
 """Utilidades para la interfaz gráfica"""
-from PySide6.QtWidgets import QGraphicsDropShadowEffect, QLabel
-from PySide6.QtGui import QColor
+from PySide6.QtWidgets import QLabel
 from PySide6.QtCore import Qt
 
 
-def add_shadow(widget, blur_radius=10, offset=2):
-    """Agrega sombra a un widget"""
-    shadow = QGraphicsDropShadowEffect()
-    shadow.setBlurRadius(blur_radius)
-    shadow.setColor(QColor(0, 0, 0, 80))
-    shadow.setOffset(offset, offset)
-    widget.setGraphicsEffect(shadow)
+def add_shadow(widget):
+    """Marca el widget para la sombra simulada por QSS (regla [shadowed] en STYLES)
+
+    Sin QGraphicsDropShadowEffect: el efecto obliga a renderizar la card
+    fuera de pantalla en cada repintado.
+    """
+    widget.setProperty("shadowed", True)
+    # Reaplicar el estilo por si el widget ya estaba pulido
+    widget.style().unpolish(widget)
+    widget.style().polish(widget)
+
+
+# Parámetros optimizados en el orden de la tabla de resultados
+PARAMS_TO_SHOW = ('initLRATIO', 'TKI_effect', 'p_XY', 'p_YX', 'p_Y', 'K_Z', 'p_Z')
+_SCI_PARAMS = frozenset(('p_XY', 'p_YX', 'K_Z', 'p_Z'))
+
+
+def format_param_rows(params):
+    """Convierte los parámetros optimizados en filas (nombre, valor formateado)"""
+    return [
+        (param, f"{params[param]:.6e}" if param in _SCI_PARAMS else f"{params[param]:.6f}")
+        for param in PARAMS_TO_SHOW
+        if param in params
+    ]
 
 
 def create_card_title(text):
     """Crea un label de título estandarizado"""
     label = QLabel(text)
-    label.setStyleSheet("font-weight: normal; font-size: 14px; color: #07210F;")
+    label.setObjectName("card_title")  # Estilo en STYLES
     label.setAlignment(Qt.AlignCenter)
     return label
+
+
+def create_field_label(text, min_width=0):
+    """Crea el label de un campo de formulario (estilo #field_label en STYLES)"""
+    label = QLabel(text)
+    label.setObjectName("field_label")
+    if min_width:
+        label.setMinimumWidth(min_width)
+    return label
@@ -1,14 +1,34 @@
 
 import json
 import math
-import random
+from bisect import bisect_right
+from collections import namedtuple
 import numpy as np
 from scipy.integrate import odeint
 from PySide6.QtCore import QThread, Signal
 from PySide6.QtWidgets import QMessageBox
 
+from ui.helpers import format_param_rows
+
 # matplotlib se importa bajo demanda en funciones que lo necesitan
 
+# numba es opcional: si no está instalado, los kernels corren como Python normal
+try:
+    from numba import njit as _njit, prange, config as _numba_config
+    # Los kernels paralelos se lanzan desde OptimizationThread (no el hilo
+    # principal): con la capa TBB el proceso queda colgado al salir; la capa
+    # 'workqueue' (incluida siempre en numba) es segura desde cualquier hilo
+    _numba_config.THREADING_LAYER = 'workqueue'
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    prange = range
+
+    def _njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
+
 # ========== CONSTANTES DEL MODELO CML ==========
 DETECTION_LIMIT = 0.0001  # Límite de detección BCR-ABL (0.01% en escala decimal)
 K_Y = 1e6                  # Capacidad de carga del compartimiento Y (células leucémicas)
@@ -27,10 +47,38 @@ GENE_BOUNDS = {
     'p_Z': (20.0, 12649111.0)       # Tasa de estimulación inmune por células Y
 }
 
+# Orden fijo de los parámetros en los arreglos float64 (mismo orden que GENE_BOUNDS)
+PARAM_NAMES = tuple(GENE_BOUNDS)
+IDX_INIT_LRATIO = 0
+IDX_TKI_EFFECT = 1
+IDX_P_XY = 2
+IDX_P_YX = 3
+IDX_P_Y = 4
+IDX_K_Z = 5
+IDX_P_Z = 6
+
+
+def params_to_array(params):
+    """
+    Convierte los parámetros a un arreglo float64 de largo 7 (orden PARAM_NAMES).
+    
+    Acepta el diccionario que usa la interfaz o un arreglo ya convertido,
+    que se retorna sin copiar.
+    """
+    if isinstance(params, np.ndarray):
+        return params
+    return np.array([params[name] for name in PARAM_NAMES], dtype=np.float64)
+
+
+def array_to_params(params_arr):
+    """Diccionario {nombre: valor} de un arreglo de parámetros (frontera con la UI)"""
+    return {name: float(value) for name, value in zip(PARAM_NAMES, params_arr)}
+
 
 # ========== MODELO MATEMÁTICO CML ==========
 
-def cml_model(y, t, params, dose_factor=1.0):
+@_njit(cache=True)
+def cml_model(y, t, params_arr, dose_factor=1.0):
     """
     Sistema de ecuaciones diferenciales del modelo CML de 3 compartimientos.
     
@@ -39,30 +87,32 @@ def cml_model(y, t, params, dose_factor=1.0):
     - Y: Células leucémicas diferenciadas
     - Z: Células inmunes efectoras
     
+    Compilado con numba si está disponible: odeint lo llama en cada paso
+    interno, así que los parámetros llegan como arreglo (ver params_to_array)
+    y se leen por índice, sin accesos a diccionario.
+    
     Parámetros:
         y: Vector [X, Y, Z] con el estado actual del sistema
         t: Tiempo en meses
-        params: Diccionario con los 7 parámetros del modelo
+        params_arr: Arreglo float64 con los 7 parámetros (orden PARAM_NAMES)
         dose_factor: Factor de dosis del TKI (1.0=100%, 0.5=50%, 0.0=sin tratamiento)
     
     Retorna:
-        [dX/dt, dY/dt, dZ/dt]: Derivadas del sistema
+        (dX/dt, dY/dt, dZ/dt): Derivadas del sistema
     """
-    X, Y, Z = y
-    
     # Validar que los valores sean físicamente posibles (no negativos)
-    X = max(X, 0.0)
-    Y = max(Y, 0.0)
-    Z = max(Z, 0.0)
+    X = max(y[0], 0.0)
+    Y = max(y[1], 0.0)
+    Z = max(y[2], 0.0)
     
     # Extraer parámetros del modelo
-    p_XY = params['p_XY']           # Tasa de diferenciación X → Y
-    p_YX = params['p_YX']           # Tasa de des-diferenciación Y → X
-    p_Y = params['p_Y']             # Tasa de proliferación de Y
-    TKI_effect = params['TKI_effect']  # Efectividad del inhibidor TKI
-    K_Z = params['K_Z']             # Semi-saturación de respuesta inmune
-    p_Z = params['p_Z']             # Estimulación inmune
-
+    p_XY = params_arr[IDX_P_XY]              # Tasa de diferenciación X → Y
+    p_YX = params_arr[IDX_P_YX]              # Tasa de des-diferenciación Y → X
+    p_Y = params_arr[IDX_P_Y]                # Tasa de proliferación de Y
+    TKI_effect = params_arr[IDX_TKI_EFFECT]  # Efectividad del inhibidor TKI
+    K_Z = params_arr[IDX_K_Z]                # Semi-saturación de respuesta inmune
+    p_Z = params_arr[IDX_P_Z]                # Estimulación inmune
+    
     # Ecuación para X: flujo entre compartimientos
     dX_dt = p_YX * Y - p_XY * X
     
@@ -73,7 +123,7 @@ def cml_model(y, t, params, dose_factor=1.0):
     # Ecuación para Z: respuesta inmune con saturación tipo Hill
     dZ_dt = (R_Z + p_Z * Z * Y / (K_Z**2 + Y**2) - A_Z * Z)
     
-    return [dX_dt, dY_dt, dZ_dt]
+    return (dX_dt, dY_dt, dZ_dt)
 
 
 def get_initial_conditions(params):
@@ -84,24 +134,30 @@ def get_initial_conditions(params):
     A partir de este valor se calculan las poblaciones iniciales de cada compartimiento.
     
     Parámetros:
-        params: Diccionario que debe contener 'initLRATIO', 'p_XY' y 'p_YX'
+        params: Diccionario o arreglo de parámetros (ver params_to_array)
     
     Retorna:
         array([X0, Y0, Z0]): Condiciones iniciales del sistema
     """
-    initLRATIO = params['initLRATIO']
+    return _initial_conditions(params_to_array(params))
+
+
+@_njit(cache=True)
+def _initial_conditions(params_arr):
+    """Kernel de get_initial_conditions sobre el arreglo de parámetros"""
+    initLRATIO = params_arr[IDX_INIT_LRATIO]
     
     # Convertir de escala logarítmica a decimal
     R = 10.0 ** initLRATIO
-    R = np.clip(R, 1e-12, 0.999999)
+    R = min(max(R, 1e-12), 0.999999)
     
     # Calcular Y0 a partir del ratio BCR-ABL inicial
     Y0 = (2.0 * R * K_Y) / (1.0 + R)
     Y0 = min(Y0, K_Y * 0.99)
     
     # Calcular X0 asumiendo equilibrio entre transiciones X ↔ Y
-    p_XY = max(params['p_XY'], 1e-12)
-    p_YX = max(params['p_YX'], 1e-12)
+    p_XY = max(params_arr[IDX_P_XY], 1e-12)
+    p_YX = max(params_arr[IDX_P_YX], 1e-12)
     X0 = (p_YX / p_XY) * Y0
     
     # Z0 en estado estacionario basal (sin tumor)
@@ -115,6 +171,121 @@ def get_initial_conditions(params):
     return np.array([X0, Y0, Z0])
 
 
+# Tolerancias de integración (las mismas para odeint y para _rk45_solve).
+# El fitness compara en log10 y basta ~1e-3 relativo en Y: con 1e-4/1e-6 el
+# GA llega a los mismos óptimos que con 1e-6/1e-8 en menos pasos
+RTOL = 1e-4
+ATOL = 1e-6
+# Pasos aceptados máximos de _rk45_solve antes de delegar en odeint (sistema rígido)
+RK45_MAX_STEPS = 5000
+# Pasos internos máximos de odeint por tramo; si se agotan, la simulación
+# se descarta (NaN) en vez de seguir con una solución incompleta
+ODEINT_MXSTEP = 2000
+
+
+@_njit(cache=True)
+def _rk45_solve(y0, times, doses, params_arr, rtol, atol, max_steps, y_max):
+    """
+    Integrador Dormand-Prince 5(4) adaptativo, especializado al sistema CML.
+    
+    Integra tramo a tramo: entre times[k] y times[k+1] la dosis es doses[k],
+    y cada tramo termina exactamente en su tiempo de salida (sin interpolar).
+    Compilado con numba evita por completo el intérprete en los pasos internos.
+    
+    Si el sistema se vuelve rígido el paso colapsa; al superar 'max_steps'
+    pasos aceptados (o si el paso se hace despreciable) se abandona y
+    se retorna ok=False para que el llamador use odeint (LSODA).
+    
+    Si al cierre de un tramo Y supera y_max (o no es finito) la solución ya es
+    físicamente inválida: se corta ahí, con NaN en las filas restantes y
+    ok=True (no tiene sentido repetirla con odeint). Con y_max=inf no se corta.
+    
+    Retorna:
+        (sol, ok): Arreglo (n_tiempos, 3) con [X, Y, Z] y si la integración terminó
+    """
+    n = times.shape[0]
+    sol = np.empty((n, 3))
+    sol[0, :] = y0
+    y = y0.copy()
+    y_new = np.empty(3)
+    y_tmp = np.empty(3)
+    k1 = np.empty(3)
+    k2 = np.empty(3)
+    k3 = np.empty(3)
+    k4 = np.empty(3)
+    k5 = np.empty(3)
+    k6 = np.empty(3)
+    k7 = np.empty(3)
+    steps = 0
+    h = 0.0
+    
+    for seg in range(n - 1):
+        t = times[seg]
+        t_end = times[seg + 1]
+        dose = doses[seg]
+        if t_end > t and h == 0.0:
+            h = 0.01 * (t_end - t)
+        
+        while t < t_end:
+            if steps >= max_steps:
+                return sol, False
+            h = min(h, t_end - t)
+            if h <= 1e-12 * max(1.0, abs(t)):
+                return sol, False
+            
+            k1[0], k1[1], k1[2] = cml_model(y, t, params_arr, dose)
+            for i in range(3):
+                y_tmp[i] = y[i] + h * (k1[i] / 5.0)
+            k2[0], k2[1], k2[2] = cml_model(y_tmp, t + h / 5.0, params_arr, dose)
+            for i in range(3):
+                y_tmp[i] = y[i] + h * (3.0 / 40.0 * k1[i] + 9.0 / 40.0 * k2[i])
+            k3[0], k3[1], k3[2] = cml_model(y_tmp, t + 0.3 * h, params_arr, dose)
+            for i in range(3):
+                y_tmp[i] = y[i] + h * (44.0 / 45.0 * k1[i] - 56.0 / 15.0 * k2[i] + 32.0 / 9.0 * k3[i])
+            k4[0], k4[1], k4[2] = cml_model(y_tmp, t + 0.8 * h, params_arr, dose)
+            for i in range(3):
+                y_tmp[i] = y[i] + h * (19372.0 / 6561.0 * k1[i] - 25360.0 / 2187.0 * k2[i]
+                                       + 64448.0 / 6561.0 * k3[i] - 212.0 / 729.0 * k4[i])
+            k5[0], k5[1], k5[2] = cml_model(y_tmp, t + 8.0 / 9.0 * h, params_arr, dose)
+            for i in range(3):
+                y_tmp[i] = y[i] + h * (9017.0 / 3168.0 * k1[i] - 355.0 / 33.0 * k2[i]
+                                       + 46732.0 / 5247.0 * k3[i] + 49.0 / 176.0 * k4[i]
+                                       - 5103.0 / 18656.0 * k5[i])
+            k6[0], k6[1], k6[2] = cml_model(y_tmp, t + h, params_arr, dose)
+            for i in range(3):
+                y_new[i] = y[i] + h * (35.0 / 384.0 * k1[i] + 500.0 / 1113.0 * k3[i]
+                                       + 125.0 / 192.0 * k4[i] - 2187.0 / 6784.0 * k5[i]
+                                       + 11.0 / 84.0 * k6[i])
+            k7[0], k7[1], k7[2] = cml_model(y_new, t + h, params_arr, dose)
+            
+            # Error local (diferencia entre las soluciones de orden 5 y 4), norma RMS
+            err = 0.0
+            for i in range(3):
+                e_i = h * (71.0 / 57600.0 * k1[i] - 71.0 / 16695.0 * k3[i] + 71.0 / 1920.0 * k4[i]
+                           - 17253.0 / 339200.0 * k5[i] + 22.0 / 525.0 * k6[i] - 1.0 / 40.0 * k7[i])
+                scale = atol + rtol * max(abs(y[i]), abs(y_new[i]))
+                err += (e_i / scale) ** 2
+            err = math.sqrt(err / 3.0)
+            if math.isnan(err):
+                return sol, False
+            
+            if err <= 1.0:
+                t += h
+                y[:] = y_new
+                steps += 1
+                factor = 5.0 if err == 0.0 else min(5.0, 0.9 * err ** -0.2)
+            else:
+                factor = max(0.2, 0.9 * err ** -0.2)
+            h *= factor
+        
+        sol[seg + 1, :] = y
+        if not (y[1] <= y_max):
+            sol[seg + 2:, :] = np.nan
+            return sol, True
+    
+    return sol, True
+
+
 def simulate_model_with_variable_dosing(params, time_dose_pairs):
     """
     Simula el modelo CML con un calendario de dosis variable en el tiempo.
@@ -122,7 +293,7 @@ def simulate_model_with_variable_dosing(params, time_dose_pairs):
     Permite modelar escenarios como: dosis completa → reducción → cesación.
     
     Parámetros:
-        params: Diccionario con los parámetros del modelo
+        params: Diccionario o arreglo de parámetros (ver params_to_array)
         time_dose_pairs: Lista de tuplas (tiempo_meses, fraccion_dosis)
                          Ejemplo: [(0, 1.0), (12, 0.5), (24, 0.0)]
     
@@ -133,29 +304,52 @@ def simulate_model_with_variable_dosing(params, time_dose_pairs):
     # Ordenar por tiempo
     time_dose_pairs = sorted(time_dose_pairs, key=lambda x: x[0])
     time_points = [t for (t, d) in time_dose_pairs]
+    params_arr = params_to_array(params)
+    
+    # Obtener condiciones iniciales
+    y0 = get_initial_conditions(params_arr)
+    
+    # Con numba, integrador RK45 compilado; si el sistema resulta rígido se
+    # repite la simulación con odeint (LSODA)
+    if NUMBA_AVAILABLE and time_points:
+        times = np.array(time_points, dtype=np.float64)
+        doses = np.array([d for (t, d) in time_dose_pairs], dtype=np.float64)
+        sol, ok = _rk45_solve(y0, times, doses, params_arr, RTOL, ATOL, RK45_MAX_STEPS, np.inf)
+        if ok:
+            return sol, time_points
+    
+    return _simulate_odeint(params_arr, y0, time_dose_pairs), time_points
 
-    # Función auxiliar que aplica la dosis correspondiente a cada tiempo
-    def model_with_variable_dosing(y, t):
-        current_dose = 1.0
-        # Encontrar la dosis vigente en el tiempo t
-        for tv, dv in time_dose_pairs:
-            if tv <= t:
-                current_dose = dv
-            else:
-                break
-        return cml_model(y, t, params, current_dose)
 
-    # Obtener condiciones iniciales
-    y0 = get_initial_conditions(params)
+def _simulate_odeint(params_arr, y0, time_dose_pairs):
+    """
+    Integración con odeint (LSODA) de simulate_model_with_variable_dosing.
     
-    # Integrar el sistema de ecuaciones diferenciales
+    'time_dose_pairs' debe venir ordenado por tiempo. Retorna la solución
+    (n_tiempos, 3), o NaN si la integración falla o agota ODEINT_MXSTEP.
+    """
+    time_points = [t for (t, d) in time_dose_pairs]
+    
+    # Integrar por tramos de dosis constante: la dosis de cada punto rige hasta
+    # el siguiente, así el RHS no busca la dosis vigente en cada paso interno
     try:
-        sol = odeint(model_with_variable_dosing, y0, time_points, 
-                     rtol=1e-6, atol=1e-8, mxstep=10000)
-        return sol, time_points
+        sol = np.empty((len(time_points), 3))
+        sol[0] = y0
+        for k in range(1, len(time_points)):
+            t_start, dose = time_dose_pairs[k - 1]
+            t_end = time_points[k]
+            if t_end > t_start:
+                segment, info = odeint(cml_model, y0, (t_start, t_end), args=(params_arr, dose),
+                                       rtol=RTOL, atol=ATOL, mxstep=ODEINT_MXSTEP, full_output=True)
+                # Presupuesto de pasos agotado: genoma patológico, se descarta
+                if info['nst'][-1] >= ODEINT_MXSTEP:
+                    return np.full((len(time_points), 3), np.nan)
+                y0 = segment[-1]
+            sol[k] = y0
+        return sol
     except Exception as e:
         print(f"Error en simulación: {e}")
-        return np.full((len(time_points), 3), np.nan), time_points
+        return np.full((len(time_points), 3), np.nan)
 
 
 def calculate_lratio(Y):
@@ -167,19 +361,21 @@ def calculate_lratio(Y):
     
     Esta es la medida clínica estándar usada para evaluar la respuesta molecular.
     
+    Vectorizado: acepta un valor o el arreglo completo de Y simulado, así
+    una trayectoria se convierte con una sola pasada de numpy.
+    
     Parámetros:
-        Y: Número de células leucémicas diferenciadas
+        Y: Número de células leucémicas diferenciadas (escalar o arreglo)
     
     Retorna:
         lratio: log10 del ratio BCR-ABL (valor negativo, ej: -2.0 = 1%, -4.0 = 0.01%)
     """
     eps = 1e-12
+    Y = np.asarray(Y, dtype=np.float64)
     denom = Y + 2.0 * (K_Y - Y)
     
-    if denom <= 0:
-        ratio_decimal = eps
-    else:
-        ratio_decimal = Y / denom
+    with np.errstate(divide='ignore', invalid='ignore'):
+        ratio_decimal = np.where(denom > 0, Y / denom, eps)
     
     ratio_decimal = np.clip(ratio_decimal, eps, 1.0)
     return np.log10(ratio_decimal)
@@ -201,6 +397,250 @@ def calculate_bcr_abl_ratio_decimal(Y):
     return max(Y / denom, 1e-12)
 
 
+# ========== DATOS CLÍNICOS EN FORMATO ARREGLO ==========
+
+# Datos clínicos como arreglos float64 contiguos (una fila por medición, ordenadas por tiempo)
+ClinicalArrays = namedtuple('ClinicalArrays', ['months', 'bcr', 'dose'])
+
+
+def is_nd(value):
+    """
+    Indica si un valor de BCR-ABL es "No Detectable".
+    
+    Acepta las dos representaciones en uso: el texto 'ND' de los historiales
+    precargados y NaN de los arreglos extraídos de la tabla.
+    """
+    if isinstance(value, str):
+        return value.upper() == 'ND'
+    return isinstance(value, float) and math.isnan(value)
+
+
+def prepare_clinical_arrays(clinical_data):
+    """
+    Convierte los datos clínicos a arreglos NumPy contiguos, una sola vez por optimización.
+    
+    Así la función de fitness no vuelve a recorrer ni interpretar la lista
+    en cada evaluación del algoritmo genético.
+    
+    Codificación de BCR-ABL:
+    - 'ND' (No Detectable) → NaN
+    - Valores no numéricos → 0.0 (se descartan al evaluar, igual que antes)
+    
+    Parámetros:
+        clinical_data: Lista de tuplas (tiempo, valor_BCR_ABL, dosis), ndarray
+                       (N, 3) con NaN para ND, o ClinicalArrays
+    
+    Retorna:
+        ClinicalArrays(months, bcr, dose) ordenado por tiempo (orden estable)
+    """
+    if isinstance(clinical_data, ClinicalArrays):
+        return clinical_data
+    
+    if isinstance(clinical_data, np.ndarray):
+        # Ya viene codificado (ND = NaN): solo ordenar y separar columnas
+        arr = np.asarray(clinical_data, dtype=np.float64).reshape(-1, 3)
+        arr = arr[np.argsort(arr[:, 0], kind='stable')]
+        return ClinicalArrays(
+            np.ascontiguousarray(arr[:, 0]),
+            np.ascontiguousarray(arr[:, 1]),
+            np.ascontiguousarray(arr[:, 2]),
+        )
+    
+    rows = sorted(clinical_data, key=lambda x: x[0])
+    n = len(rows)
+    months = np.empty(n, dtype=np.float64)
+    bcr = np.empty(n, dtype=np.float64)
+    dose = np.empty(n, dtype=np.float64)
+    
+    for i, (t, val, d) in enumerate(rows):
+        months[i] = t
+        dose[i] = d
+        if isinstance(val, str) and val.upper() == 'ND':
+            bcr[i] = np.nan
+        else:
+            try:
+                bcr[i] = float(val)
+            except (ValueError, TypeError):
+                bcr[i] = 0.0
+    
+    return ClinicalArrays(months, bcr, dose)
+
+
+# Datos de fitness precalculados una vez por optimización (ver preprocess_clinical)
+FitnessData = namedtuple('FitnessData', ['time_dose_pairs', 'times', 'doses', 'clin_lratio', 'weight',
+                                         'nd_mask', 'target_nd'])
+
+
+def _dose_weight(dose):
+    """Peso base de un punto clínico según la fase de tratamiento (dosis)"""
+    if dose == 1.0:
+        return 2.0
+    if dose == 0.5:
+        return 1.5
+    if dose == 0.25:
+        return 1.3
+    if dose == 0.0:
+        return 2.5
+    return 1.0
+
+
+def preprocess_clinical(clinical_data, detection_limit=DETECTION_LIMIT):
+    """
+    Precalcula todo lo que calculate_fitness necesita de los datos clínicos.
+    
+    El calendario de dosis, el lratio clínico y los pesos de cada punto no
+    dependen de los parámetros del modelo, así que se calculan una sola vez
+    por optimización en vez de en cada una de las evaluaciones del GA.
+    
+    Pesos:
+    - Base según fase de tratamiento (ver _dose_weight)
+    - x1.5 en puntos medibles de remisión profunda (BCR-ABL < 0.01)
+    - 0 en puntos no numéricos o fuera de (0, 100] (no cuentan)
+    - En puntos ND el kernel lo multiplica por 3.0 (sobre el límite) o 0.1
+    
+    Parámetros:
+        clinical_data: Datos crudos, ClinicalArrays o FitnessData (se retorna tal cual)
+        detection_limit: Límite de detección del BCR-ABL
+    
+    Retorna:
+        FitnessData(time_dose_pairs, times, doses, clin_lratio, weight, nd_mask, target_nd);
+        times/doses son el calendario en arreglos float64 para los kernels numba
+    """
+    if isinstance(clinical_data, FitnessData):
+        return clinical_data
+    
+    data = prepare_clinical_arrays(clinical_data)
+    n = len(data.months)
+    clin_lratio = np.zeros(n, dtype=np.float64)
+    weight = np.zeros(n, dtype=np.float64)
+    nd_mask = np.isnan(data.bcr)
+    
+    for i in range(n):
+        base_weight = _dose_weight(data.dose[i])
+        clinical_float = data.bcr[i]
+        if nd_mask[i]:
+            weight[i] = base_weight
+        elif 0 < clinical_float <= 100:
+            clin_lratio[i] = math.log10(max(clinical_float, 1e-12))
+            # Peso adicional para remisión profunda (MR4 o mejor)
+            weight[i] = base_weight * 1.5 if clinical_float < 0.01 else base_weight
+    
+    time_dose_pairs = tuple(zip(data.months.tolist(), data.dose.tolist()))
+    target_nd = math.log10(max(detection_limit, 1e-12))
+    times = np.array(data.months, dtype=np.float64)
+    doses = np.array(data.dose, dtype=np.float64)
+    return FitnessData(time_dose_pairs, times, doses, clin_lratio, weight, nd_mask, target_nd)
+
+
+@_njit(cache=True)
+def _weighted_lratio_error(Y_sim, clin_lratio, weight, nd_mask, target_nd):
+    """
+    Kernel numérico de calculate_fitness: error cuadrático ponderado entre
+    el lratio simulado y el clínico (pesos ya calculados en preprocess_clinical).
+    Compilado con numba si está disponible.
+    
+    Retorna el fitness (negativo) o -1e12 si no hay puntos válidos.
+    """
+    total_error = 0.0
+    measured_points = 0
+    weights_sum = 0.0
+    
+    for i in range(Y_sim.shape[0]):
+        w = weight[i]
+        if w == 0.0:
+            continue
+        
+        # lratio simulado (ver calculate_lratio); Y apenas negativo (error de
+        # integración, ver _solution_is_valid) cuenta como 0
+        y = max(Y_sim[i], 0.0)
+        denom = y + 2.0 * (K_Y - y)
+        ratio = y / denom if denom > 0 else 1e-12
+        ratio = min(max(ratio, 1e-12), 1.0)
+        lratio_sim = math.log10(ratio)
+        if math.isnan(lratio_sim) or math.isinf(lratio_sim):
+            continue
+        
+        if nd_mask[i]:
+            # Punto ND: error solo si la simulación queda sobre el límite
+            if lratio_sim > target_nd:
+                penalty_weight = w * 3.0
+                total_error += (lratio_sim - target_nd) ** 2 * penalty_weight
+                weights_sum += penalty_weight
+            else:
+                weights_sum += w * 0.1
+        else:
+            total_error += (lratio_sim - clin_lratio[i]) ** 2 * w
+            weights_sum += w
+        measured_points += 1
+    
+    if measured_points == 0 or weights_sum == 0:
+        return -1e12
+    
+    normalized_error = total_error / weights_sum
+    if measured_points < 3:
+        normalized_error *= (5.0 / measured_points)
+    
+    return -normalized_error
+
+
+@_njit(cache=True)
+def _solution_is_valid(sol, rtol, atol):
+    """
+    Validación física de una solución (n_tiempos, 3) en una sola pasada:
+    todo finito, Y <= K_Y*100 y Y no negativo salvo error de integración.
+    
+    El modelo nunca lleva Y bajo cero (dY/dt >= 0 en Y = 0), así que un Y
+    negativo solo puede ser error numérico. En remisión profunda Y es menor
+    que la tolerancia y el error global escala con el máximo de Y en la
+    trayectoria: se acepta Y >= -(atol + rtol * max(Y)) (el fitness lo toma como 0).
+    """
+    y_max = K_Y * 100
+    y_min = 0.0
+    y_peak = 0.0
+    for k in range(sol.shape[0]):
+        x, y, z = sol[k, 0], sol[k, 1], sol[k, 2]
+        if not (math.isfinite(x) and math.isfinite(y) and math.isfinite(z) and y <= y_max):
+            return False
+        y_min = min(y_min, y)
+        y_peak = max(y_peak, y)
+    return y_min >= -(atol + rtol * y_peak)
+
+
+@_njit(cache=True, parallel=True)
+def _batch_fitness(population, times, doses, clin_lratio, weight, nd_mask, target_nd, rtol, atol, max_steps):
+    """
+    Fitness de toda una población con _rk45_solve, en paralelo por individuo.
+    
+    Aplica las mismas validaciones que calculate_fitness. Los individuos
+    cuyo integrador RK45 no termina (sistema rígido) quedan con solved=False
+    para que el llamador los evalúe con calculate_fitness (odeint). La
+    integración de un individuo se corta en cuanto Y sale del rango válido.
+    
+    Retorna:
+        (fitnesses, solved): Arreglos de largo n_individuos
+    """
+    n = population.shape[0]
+    fitnesses = np.empty(n)
+    solved = np.ones(n, dtype=np.bool_)
+    
+    for i in prange(n):
+        params_arr = population[i]
+        sol, ok = _rk45_solve(_initial_conditions(params_arr), times, doses, params_arr,
+                              rtol, atol, max_steps, K_Y * 100)
+        if not ok:
+            solved[i] = False
+            fitnesses[i] = -1e12
+            continue
+        
+        if not _solution_is_valid(sol, rtol, atol):
+            fitnesses[i] = -1e12
+        else:
+            fitnesses[i] = _weighted_lratio_error(np.ascontiguousarray(sol[:, 1]), clin_lratio, weight,
+                                                  nd_mask, target_nd)
+    
+    return fitnesses, solved
+
+
 # ========== FUNCIONES DE FITNESS (EVALUACIÓN DE CALIDAD) ==========
 
 def fitness_function_with_dosing(params, clinical_data_with_dosing, detection_limit=DETECTION_LIMIT):
@@ -218,29 +658,25 @@ def fitness_function_with_dosing(params, clinical_data_with_dosing, detection_li
     Retorna:
         fitness: Valor negativo (más cercano a 0 = mejor ajuste)
     """
-    # Preparar datos para la simulación
-    time_dose_pairs = [(t, dose) for (t, val, dose) in clinical_data_with_dosing]
-    solution, time_points_sim = simulate_model_with_variable_dosing(params, time_dose_pairs)
+    # Preparar datos para la simulación (mismo orden que la solución)
+    rows = sorted(clinical_data_with_dosing, key=lambda x: x[0])
+    time_dose_pairs = [(t, dose) for (t, val, dose) in rows]
+    solution, _ = simulate_model_with_variable_dosing(params, time_dose_pairs)
     
     # Verificar que la simulación sea válida
     if np.any(np.isnan(solution)):
         return -1e12
     
-    # Extraer valores de Y y calcular lratio para cada punto
-    Y_sim = solution[:, 1]
-    lratio_simulated_dict = {t: calculate_lratio(y) for t, y in zip(time_points_sim, Y_sim)}
+    # lratio de toda la trayectoria de Y (una fila por punto clínico)
+    lratio_simulated = calculate_lratio(solution[:, 1])
     
     total_error = 0.0
     measured_points = 0
     
     # Comparar simulación con cada punto clínico
-    for t, clinical_val, dose in clinical_data_with_dosing:
-        if t not in lratio_simulated_dict:
-            continue
-        lratio_sim = lratio_simulated_dict[t]
-        
+    for lratio_sim, (t, clinical_val, dose) in zip(lratio_simulated, rows):
         # Caso 1: Punto "No Detectable" (ND)
-        if isinstance(clinical_val, str) and clinical_val.upper() == 'ND':
+        if is_nd(clinical_val):
             target_lratio = np.log10(max(detection_limit, 1e-12))
             if lratio_sim > target_lratio:
                 # Penalizar: la simulación predice valor detectable cuando debería ser ND
@@ -286,118 +722,34 @@ def calculate_fitness(params, clinical_data_with_dosing, detection_limit=DETECTI
     
     Parámetros:
         params: Diccionario con los parámetros del modelo
-        clinical_data_with_dosing: Lista de tuplas (tiempo, valor_BCR_ABL, dosis)
-        detection_limit: Límite de detección del BCR-ABL
+        clinical_data_with_dosing: Lista de tuplas (tiempo, valor_BCR_ABL, dosis),
+                                   ClinicalArrays o FitnessData ya preprocesado
+                                   (ver preprocess_clinical)
+        detection_limit: Límite de detección del BCR-ABL (ya incluido en FitnessData)
     
     Retorna:
         fitness: Valor negativo normalizado (más cercano a 0 = mejor)
     """
     try:
-        time_dose_pairs = [(t, dose) for (t, val, dose) in clinical_data_with_dosing]
-        solution, time_points_sim = simulate_model_with_variable_dosing(params, time_dose_pairs)
-        
-        # Verificar solución válida
-        if np.any(np.isnan(solution)) or np.any(np.isinf(solution)):
-            return -1e12
-        
-        Y_sim = solution[:, 1]
-        
-        # Verificar valores físicamente válidos
-        if np.any(Y_sim < 0) or np.any(Y_sim > K_Y * 100):
-            return -1e12
-            
-        lratio_simulated_dict = {t: calculate_lratio(y) for t, y in zip(time_points_sim, Y_sim)}
-        
-        total_error = 0.0
-        measured_points = 0
-        weights_sum = 0.0
-        
-        for t, clinical_val, dose in clinical_data_with_dosing:
-            if t not in lratio_simulated_dict:
-                continue
-                
-            lratio_sim = lratio_simulated_dict[t]
-            
-            # Verificar que lratio_sim es válido
-            if np.isnan(lratio_sim) or np.isinf(lratio_sim):
-                continue
-            
-            # Peso base según fase de tratamiento
-            if dose == 1.0:  # Dosis completa
-                base_weight = 2.0
-            elif dose == 0.5:  # Reducción 50%
-                base_weight = 1.5
-            elif dose == 0.25:  # Reducción 25%
-                base_weight = 1.3
-            elif dose == 0.0:  # Post-cesación
-                base_weight = 2.5  # Mayor peso después de parar
-            else:
-                base_weight = 1.0
-                
-            # Procesar punto ND (No Detectable)
-            if isinstance(clinical_val, str) and clinical_val.upper() == 'ND':
-                target_lratio = np.log10(max(detection_limit, 1e-12))
-                
-                # Si la simulación está SOBRE el límite de detección, es un ERROR
-                if lratio_sim > target_lratio:
-                    error = (lratio_sim - target_lratio) ** 2
-                    # PENALIZAR MÁS (no menos) - multiplicador 3.0
-                    penalty_weight = base_weight * 3.0
-                    total_error += error * penalty_weight
-                    weights_sum += penalty_weight
-                    measured_points += 1
-                else:
-                    # Simulación correcta (bajo límite), pequeña recompensa
-                    # Aún contamos el punto para normalización
-                    bonus_weight = base_weight * 0.1
-                    weights_sum += bonus_weight
-                    measured_points += 1
-                    
-            # Procesar punto con valor medible
-            else:
-                try:
-                    clinical_float = float(clinical_val)
-                    
-                    # Validar valor clínico
-                    if clinical_float <= 0 or clinical_float > 100:
-                        continue
-                        
-                    clinical_lratio = np.log10(max(clinical_float, 1e-12))
-                    
-                    # Error cuadrático ponderado
-                    error = (lratio_sim - clinical_lratio) ** 2
-                    
-                    # Peso adicional para valores muy bajos (remisión profunda)
-                    if clinical_float < 0.01:  # MR4 o mejor
-                        final_weight = base_weight * 1.5
-                    else:
-                        final_weight = base_weight
-                    
-                    total_error += error * final_weight
-                    weights_sum += final_weight
-                    measured_points += 1
-                    
-                except (ValueError, TypeError):
-                    continue
-        
-        # Sin puntos válidos = fitness pésimo
-        if measured_points == 0 or weights_sum == 0:
-            return -1e12
-        
-        # Normalizar por suma de pesos (no solo por número de puntos)
-        normalized_error = total_error / weights_sum
-        
-        # Penalización adicional si hay muy pocos puntos ajustados
-        if measured_points < 3:
-            normalized_error *= (5.0 / measured_points)
-        
-        return -normalized_error
+        data = preprocess_clinical(clinical_data_with_dosing, detection_limit)
+        solution, _ = simulate_model_with_variable_dosing(params, data.time_dose_pairs)
+        return _solution_fitness(solution, data)
         
     except Exception as e:
         print(f"Error en fitness function: {e}")
         return -1e12
 
 
+def _solution_fitness(solution, data):
+    """Fitness de una solución ya integrada (validaciones físicas + kernel)"""
+    # Verificar solución finita y físicamente válida (una sola pasada)
+    if not _solution_is_valid(solution, RTOL, ATOL):
+        return -1e12
+    
+    Y_sim = np.ascontiguousarray(solution[:, 1])
+    return _weighted_lratio_error(Y_sim, data.clin_lratio, data.weight, data.nd_mask, data.target_nd)
+
+
 def calculate_fitness_simple(params, clinical_data_with_dosing, detection_limit=DETECTION_LIMIT):
     """
     Versión alternativa simplificada de la función de fitness.
@@ -410,28 +762,22 @@ def calculate_fitness_simple(params, clinical_data_with_dosing, detection_limit=
     Útil como función de respaldo o para comparaciones.
     """
     try:
-        time_dose_pairs = [(t, dose) for (t, val, dose) in clinical_data_with_dosing]
-        solution, time_points_sim = simulate_model_with_variable_dosing(params, time_dose_pairs)
+        rows = sorted(clinical_data_with_dosing, key=lambda x: x[0])
+        time_dose_pairs = [(t, dose) for (t, val, dose) in rows]
+        solution, _ = simulate_model_with_variable_dosing(params, time_dose_pairs)
         
-        if np.any(np.isnan(solution)) or np.any(np.isinf(solution)):
+        # Verificar solución finita y físicamente válida (una sola pasada)
+        if not _solution_is_valid(solution, RTOL, ATOL):
             return -1e12
         
-        Y_sim = solution[:, 1]
+        Y_sim = np.maximum(solution[:, 1], 0.0)
         
-        # Verificar valores físicamente válidos
-        if np.any(Y_sim < 0) or np.any(Y_sim > K_Y * 100):
-            return -1e12
-            
-        lratio_simulated_dict = {t: calculate_lratio(y) for t, y in zip(time_points_sim, Y_sim)}
+        # lratio de toda la trayectoria de Y (una fila por punto clínico)
+        lratio_simulated = calculate_lratio(Y_sim)
         
         errors = []
         
-        for t, clinical_val, dose in clinical_data_with_dosing:
-            if t not in lratio_simulated_dict:
-                continue
-            
-            lratio_sim = lratio_simulated_dict[t]
-            
+        for lratio_sim, (t, clinical_val, dose) in zip(lratio_simulated, rows):
             # Verificar valor válido
             if np.isnan(lratio_sim) or np.isinf(lratio_sim):
                 continue
@@ -439,7 +785,7 @@ def calculate_fitness_simple(params, clinical_data_with_dosing, detection_limit=
             # Peso simple: post-cesación pesa el doble
             weight = 2.0 if dose == 0.0 else 1.0
             
-            if isinstance(clinical_val, str) and clinical_val.upper() == 'ND':
+            if is_nd(clinical_val):
                 target_lratio = np.log10(detection_limit)
                 if lratio_sim > target_lratio:
                     # Penalizar proporcionalmente a qué tan lejos está
@@ -467,146 +813,208 @@ def calculate_fitness_simple(params, clinical_data_with_dosing, detection_limit=
         return -1e12
 
 
+def evaluate_population(population, clinical_data, detection_limit=DETECTION_LIMIT, cache=None):
+    """
+    Evalúa el fitness de toda una población en un solo llamado.
+    
+    Es el único punto donde el algoritmo genético integra el modelo, de modo
+    que la evaluación por lotes (y su paralelización) queda en un solo lugar.
+    
+    Con 'cache' (diccionario) se memoiza el fitness por los bytes del arreglo
+    de parámetros: los individuos que se repiten entre generaciones (élites,
+    hijos sin mutar) no se vuelven a integrar. El cache solo es válido para
+    unos mismos datos clínicos.
+    
+    Parámetros:
+        population: Arreglo (n, 7) de individuos o lista de diccionarios de parámetros
+        clinical_data: FitnessData (ver preprocess_clinical) o datos crudos
+        detection_limit: Límite de detección del BCR-ABL
+        cache: Diccionario {bytes de parámetros: fitness} a usar y completar (opcional)
+    
+    Retorna:
+        fitnesses: Arreglo float64 con el fitness de cada individuo
+    """
+    data = preprocess_clinical(clinical_data, detection_limit)
+    population = np.array([params_to_array(ind) for ind in population], dtype=np.float64).reshape(-1, len(PARAM_NAMES))
+    fitnesses = np.empty(len(population), dtype=np.float64)
+    
+    # Individuos ya evaluados (cache) y pendientes
+    pending = []
+    for i, params_arr in enumerate(population):
+        fitness = cache.get(params_arr.tobytes()) if cache is not None else None
+        if fitness is None:
+            pending.append(i)
+        else:
+            fitnesses[i] = fitness
+    
+    if pending and NUMBA_AVAILABLE and len(data.time_dose_pairs) > 0:
+        # Con numba: todos los pendientes en un solo kernel paralelo; los rígidos
+        # (solved=False) se integran después con odeint directamente
+        pending = np.array(pending)
+        batch, solved = _batch_fitness(population[pending], data.times, data.doses, data.clin_lratio, data.weight,
+                                       data.nd_mask, data.target_nd, RTOL, ATOL, RK45_MAX_STEPS)
+        fitnesses[pending[solved]] = batch[solved]
+        for i in pending[~solved]:
+            # _simulate_odeint ya convierte las fallas en NaN (fitness -1e12)
+            solution = _simulate_odeint(population[i], _initial_conditions(population[i]),
+                                        data.time_dose_pairs)
+            fitnesses[i] = _solution_fitness(solution, data)
+    else:
+        for i in pending:
+            fitnesses[i] = calculate_fitness(population[i], data, detection_limit)
+    
+    if cache is not None:
+        for params_arr, fitness in zip(population, fitnesses):
+            cache[params_arr.tobytes()] = float(fitness)
+    return fitnesses
+
+
 # ========== ALGORITMO GENÉTICO ==========
 
-def create_initial_population(size):
+# Vectores por gen (orden PARAM_NAMES) para operar sobre la población completa
+GENE_LOWER = np.array([GENE_BOUNDS[name][0] for name in PARAM_NAMES])
+GENE_UPPER = np.array([GENE_BOUNDS[name][1] for name in PARAM_NAMES])
+LOG_MASK = np.array([name in ('p_XY', 'p_YX', 'K_Z', 'p_Z') for name in PARAM_NAMES])
+
+# Rangos de la población inicial: GENE_BOUNDS salvo TKI_effect y p_Y, que
+# parten de sus rangos comunes ([0.8, 2.5] y [0.5, 5.0])
+INIT_LOWER = GENE_LOWER.copy()
+INIT_UPPER = GENE_UPPER.copy()
+INIT_LOWER[IDX_TKI_EFFECT], INIT_UPPER[IDX_TKI_EFFECT] = 0.8, 2.5
+INIT_LOWER[IDX_P_Y], INIT_UPPER[IDX_P_Y] = 0.5, 5.0
+
+
+def _to_search_space(population):
+    """Genes logarítmicos a log10 (los cruces y mutaciones operan en esa escala)"""
+    genes = np.array(population, dtype=np.float64)
+    genes[..., LOG_MASK] = np.log10(genes[..., LOG_MASK])
+    return genes
+
+
+# Límites en el espacio de búsqueda (log10 en los genes logarítmicos), calculados una vez
+SEARCH_LOWER = _to_search_space(GENE_LOWER)
+SEARCH_UPPER = _to_search_space(GENE_UPPER)
+INIT_SEARCH_LOWER = _to_search_space(INIT_LOWER)
+INIT_SEARCH_UPPER = _to_search_space(INIT_UPPER)
+
+# Rango de alpha del cruce: [0.1, 0.9] en genes logarítmicos, [0.3, 0.7] en lineales
+CROSSOVER_ALPHA_LOW = np.where(LOG_MASK, 0.1, 0.3)
+CROSSOVER_ALPHA_HIGH = np.where(LOG_MASK, 0.9, 0.7)
+
+# Sigma de la mutación en el espacio de búsqueda: 0.2 en log10, 10% del rango
+# en lineales, salvo initLRATIO (0.15, parámetro sensible) y TKI_effect (5% del rango)
+MUTATION_SIGMA = np.where(LOG_MASK, 0.2, (GENE_UPPER - GENE_LOWER) * 0.1)
+MUTATION_SIGMA[IDX_INIT_LRATIO] = 0.15
+MUTATION_SIGMA[IDX_TKI_EFFECT] = (GENE_UPPER[IDX_TKI_EFFECT] - GENE_LOWER[IDX_TKI_EFFECT]) * 0.05
+
+
+def _from_search_space(genes):
+    """Inversa de _to_search_space, acotando antes a los límites de GENE_BOUNDS"""
+    genes = np.clip(genes, SEARCH_LOWER, SEARCH_UPPER)
+    genes[..., LOG_MASK] = 10.0 ** genes[..., LOG_MASK]
+    return genes
+
+
+def create_initial_population(size, rng):
     """
     Crea la población inicial de individuos con parámetros aleatorios.
     
-    Cada individuo es un diccionario con los 7 parámetros del modelo.
-    Los valores se generan aleatoriamente dentro de los rangos permitidos (GENE_BOUNDS).
+    La población es un arreglo (size, 7): una fila por individuo con los
+    parámetros en orden PARAM_NAMES (ver array_to_params para la UI).
+    Se sortea de una vez dentro de INIT_LOWER/INIT_UPPER, uniforme en
+    escala log10 para los genes logarítmicos.
     
     Parámetros:
         size: Número de individuos en la población
+        rng: numpy.random.Generator
     
     Retorna:
-        population: Lista de diccionarios, cada uno representa un individuo
-    """
-    population = []
-    for _ in range(size):
-        individual = {}
-        for gene, (lower, upper) in GENE_BOUNDS.items():
-            # Parámetros en escala logarítmica
-            if gene in ['p_XY', 'p_YX', 'K_Z', 'p_Z']:
-                individual[gene] = 10 ** random.uniform(np.log10(lower), np.log10(upper))
-            # initLRATIO: rango completo [-2.0, 0.0]
-            elif gene == 'initLRATIO':
-                individual[gene] = random.uniform(-2.0, 0.0)
-            # TKI_effect: rango común [0.8, 2.5]
-            elif gene == 'TKI_effect':
-                individual[gene] = random.uniform(0.8, 2.5)
-            # p_Y: rango común [0.5, 5.0]
-            elif gene == 'p_Y':
-                individual[gene] = random.uniform(0.5, 5.0)
-            else:
-                individual[gene] = random.uniform(lower, upper)
-        population.append(individual)
-    return population
+        population: Arreglo float64 (size, 7)
+    """
+    genes = rng.uniform(INIT_SEARCH_LOWER, INIT_SEARCH_UPPER, size=(size, len(PARAM_NAMES)))
+    return _from_search_space(genes)
 
 
-def selection(population, fitnesses, tournament_size=3):
+def selection(population, fitnesses, rng, tournament_size=3):
     """
     Selección por comparación: elige los mejores individuos para reproducirse.
     
     En cada comparación se seleccionan aleatoriamente 'tournament_size' individuos
-    y se escoge el mejor (mayor fitness) como padre.
+    distintos y se escoge el mejor (mayor fitness) como padre. Todos los torneos
+    se sortean de una vez.
     
     Parámetros:
-        population: Lista de individuos (diccionarios de parámetros)
-        fitnesses: Lista de fitness correspondiente a cada individuo
+        population: Arreglo (n, 7) de individuos
+        fitnesses: Arreglo con el fitness de cada individuo
+        rng: numpy.random.Generator
         tournament_size: Número de competidores por torneo
     
     Retorna:
-        selected: Nueva población de padres seleccionados
+        selected: Arreglo (n, 7) con los padres seleccionados (copia)
     """
-    selected = []
-    for _ in range(len(population)):
-        # Seleccionar competidores aleatorios
-        contestants = random.sample(range(len(population)), tournament_size)
-        # Elegir el ganador (mejor fitness)
-        winner = max(contestants, key=lambda i: fitnesses[i])
-        selected.append(population[winner].copy())
-    return selected
+    n = len(population)
+    # 'tournament_size' índices distintos por torneo
+    contestants = np.argpartition(rng.random((n, n)), tournament_size - 1, axis=1)[:, :tournament_size]
+    # Elegir el ganador (mejor fitness) de cada torneo
+    winners = contestants[np.arange(n), np.argmax(np.asarray(fitnesses)[contestants], axis=1)]
+    return population[winners]
 
 
-def crossover(parent1, parent2):
+def crossover(parents1, parents2, rng):
     """
-    Cruzamiento (reproducción) de dos padres para crear dos hijos.
+    Cruzamiento (reproducción) de pares de padres para crear dos hijos por par.
     
     Combina los genes de ambos padres usando interpolación:
-    - Parámetros logarítmicos: cruce en escala log
-    - Otros parámetros: cruce lineal
+    - Parámetros logarítmicos: cruce en escala log (alpha en [0.1, 0.9])
+    - Otros parámetros: cruce lineal (alpha en [0.3, 0.7])
     
     Parámetros:
-        parent1, parent2: Diccionarios con parámetros de los padres
+        parents1, parents2: Arreglos (n_pares, 7) con los padres de cada par
+        rng: numpy.random.Generator
     
     Retorna:
-        child1, child2: Dos nuevos individuos (hijos)
-    """
-    child1, child2 = {}, {}
-    for gene in parent1.keys():
-        # Genes en escala logarítmica
-        if gene in ['p_XY', 'p_YX', 'K_Z', 'p_Z']:
-            l1, l2 = np.log10(parent1[gene]), np.log10(parent2[gene])
-            alpha = random.uniform(0.1, 0.9)
-            c1_log = alpha * l1 + (1 - alpha) * l2
-            c2_log = alpha * l2 + (1 - alpha) * l1
-            lower, upper = GENE_BOUNDS[gene]
-            c1 = 10 ** np.clip(c1_log, np.log10(lower), np.log10(upper))
-            c2 = 10 ** np.clip(c2_log, np.log10(lower), np.log10(upper))
-        # Genes en escala lineal
-        else:
-            alpha = random.uniform(0.3, 0.7)
-            c1 = alpha * parent1[gene] + (1 - alpha) * parent2[gene]
-            c2 = alpha * parent2[gene] + (1 - alpha) * parent1[gene]
-            lower, upper = GENE_BOUNDS[gene]
-            c1 = np.clip(c1, lower, upper)
-            c2 = np.clip(c2, lower, upper)
-        child1[gene], child2[gene] = c1, c2
-    return child1, child2
+        children1, children2: Arreglos (n_pares, 7) con los hijos
+    """
+    genes1 = _to_search_space(parents1)
+    genes2 = _to_search_space(parents2)
+    alpha = rng.uniform(CROSSOVER_ALPHA_LOW, CROSSOVER_ALPHA_HIGH, size=genes1.shape)
+    children1 = alpha * genes1 + (1 - alpha) * genes2
+    children2 = alpha * genes2 + (1 - alpha) * genes1
+    return _from_search_space(children1), _from_search_space(children2)
 
 
-def mutate(individual, mutation_rate=0.25):
+def mutate(population, rng, mutation_rate=0.25):
     """
-    Mutación: introduce variabilidad aleatoria en un individuo.
+    Mutación: introduce variabilidad aleatoria en la población.
     
     Cada gen tiene 'mutation_rate' probabilidad de mutar.
-    La mutación añade ruido gaussiano al valor del gen.
+    La mutación añade ruido gaussiano al valor del gen:
+    - Parámetros logarítmicos: sigma 0.2 en escala log
+    - initLRATIO: sigma 0.15 (parámetro sensible)
+    - TKI_effect: sigma 5% del rango
+    - Otros parámetros: sigma 10% del rango
     
     Parámetros:
-        individual: Diccionario con parámetros
+        population: Arreglo (n, 7) de individuos
+        rng: numpy.random.Generator
         mutation_rate: Probabilidad de mutación por gen (0.25 = 25%)
     
     Retorna:
-        mutated: Nuevo individuo con mutaciones aplicadas
-    """
-    mutated = individual.copy()
-    for gene, (lower, upper) in GENE_BOUNDS.items():
-        if random.random() < mutation_rate:
-            # Parámetros logarítmicos: mutar en escala log
-            if gene in ['p_XY', 'p_YX', 'K_Z', 'p_Z']:
-                current_log = np.log10(mutated[gene])
-                new_log = current_log + random.gauss(0, 0.2)
-                mutated[gene] = 10 ** np.clip(new_log, np.log10(lower), np.log10(upper))
-            # initLRATIO: mutación más pequeña (parámetro sensible)
-            elif gene == 'initLRATIO':
-                mutation_size = 0.15  # Desviación reducida para estabilidad
-                mutated[gene] += random.gauss(0, mutation_size)
-                mutated[gene] = np.clip(mutated[gene], lower, upper)
-            # TKI_effect: mutación 5% del rango
-            elif gene == 'TKI_effect':
-                mutation_size = (upper - lower) * 0.05
-                mutated[gene] += random.gauss(0, mutation_size)
-                mutated[gene] = np.clip(mutated[gene], lower, upper)
-            # Otros parámetros: mutación 10% del rango
-            else:
-                mutation_size = (upper - lower) * 0.1
-                mutated[gene] += random.gauss(0, mutation_size)
-                mutated[gene] = np.clip(mutated[gene], lower, upper)
-    return mutated
+        mutated: Nuevo arreglo (n, 7) con las mutaciones aplicadas
+    """
+    genes = _to_search_space(population)
+    mask = rng.random(genes.shape) < mutation_rate
+    genes = genes + rng.normal(0.0, MUTATION_SIGMA, size=genes.shape)
+    # Los genes que no mutan se copian tal cual (sin ida y vuelta por log10)
+    return np.where(mask, _from_search_space(genes), population)
+
+
+# Historial del GA: mejor individuo de cada generación en arreglos
+GAHistory = namedtuple('GAHistory', ['params', 'fitness'])
 
 
-def genetic_algorithm(clinical_data, population_size=60, generations=80, progress_callback=None, stop_check=None):
+def genetic_algorithm(clinical_data, population_size=60, generations=80, progress_callback=None, stop_check=None,
+                      fitness_cache=None, rng=None):
     """
     Algoritmo genético principal para optimizar los parámetros del modelo CML.
     
@@ -619,19 +1027,38 @@ def genetic_algorithm(clinical_data, population_size=60, generations=80, progres
     6. Mantener elitismo (conservar el mejor individuo)
     7. Repetir por 'generations' iteraciones
     
+    La población es un arreglo (population_size, 7); los diccionarios de
+    parámetros solo aparecen en el resultado (frontera con la UI).
+    
     Parámetros:
-        clinical_data: Datos clínicos [(tiempo, BCR_ABL, dosis), ...]
+        clinical_data: Datos clínicos [(tiempo, BCR_ABL, dosis), ...] o FitnessData
         population_size: Tamaño de la población (60 por defecto)
         generations: Número de generaciones (80 por defecto)
         progress_callback: Función para reportar progreso (opcional)
         stop_check: Función que retorna False si se debe detener (opcional)
+        fitness_cache: Diccionario de fitness memoizados, compartible entre
+                       restarts con los mismos datos (opcional, ver evaluate_population)
+        rng: numpy.random.Generator para población inicial, selección, cruce y mutación (opcional)
+    
+    El callback recibe (gen, generations, fila de parámetros (7,), fitness).
     
     Retorna:
         best_individual: Mejor conjunto de parámetros encontrado
-        best_history: Historial de mejor individuo por generación
+        best_fitness: Fitness del mejor individuo (ya evaluado en la última generación)
+        best_history: GAHistory con los parámetros (n_gen, 7) y el fitness
+                      (n_gen,) del mejor individuo de cada generación
+                      (usar array_to_params para obtener diccionarios)
     """
-    population = create_initial_population(population_size)
-    best_history = []
+    # Preprocesar los datos clínicos una sola vez para todas las evaluaciones
+    clinical_data = preprocess_clinical(clinical_data)
+    if fitness_cache is None:
+        fitness_cache = {}
+    if rng is None:
+        rng = np.random.default_rng()
+    population = create_initial_population(population_size, rng)
+    best_params_history = np.empty((generations, len(PARAM_NAMES)))
+    best_fit_history = np.empty(generations)
+    n_done = 0
 
     for gen in range(generations):
         # Verificar si se debe detener
@@ -639,38 +1066,42 @@ def genetic_algorithm(clinical_data, population_size=60, generations=80, progres
             break
             
         # Evaluar fitness de todos los individuos usando la función principal
-        fitnesses = [calculate_fitness(ind, clinical_data) for ind in population]
+        fitnesses = evaluate_population(population, clinical_data, cache=fitness_cache)
         
         # Encontrar el mejor individuo de esta generación
         best_idx = int(np.argmax(fitnesses))
-        best_individual = population[best_idx]
-        best_fitness = fitnesses[best_idx]
-        best_history.append((best_individual.copy(), best_fitness))
+        best_params_history[gen] = population[best_idx]
+        best_fit_history[gen] = fitnesses[best_idx]
+        n_done = gen + 1
 
         # Reportar progreso si se proporcionó callback
         if progress_callback:
-            progress_callback(gen, generations, best_individual, best_fitness)
+            progress_callback(gen, generations, best_params_history[gen], float(best_fit_history[gen]))
 
         # Selección: elegir padres por torneo
-        selected = selection(population, fitnesses)
+        selected = selection(population, fitnesses, rng)
         
-        # Reproducción: crear nueva generación
-        new_population = []
-        for i in range(0, len(selected), 2):
-            p1 = selected[i]
-            p2 = selected[i+1] if i+1 < len(selected) else selected[0]
-            c1, c2 = crossover(p1, p2)
-            new_population.extend([mutate(c1), mutate(c2)])
+        # Reproducción: pares consecutivos (el último impar se cruza con el primero)
+        parents1 = selected[0::2]
+        parents2 = selected[1::2]
+        if len(parents2) < len(parents1):
+            parents2 = np.vstack([parents2, selected[:1]])
+        children1, children2 = crossover(parents1, parents2, rng)
+        children = np.empty((2 * len(parents1), len(PARAM_NAMES)))
+        children[0::2] = children1
+        children[1::2] = children2
+        new_population = mutate(children[:population_size], rng)
 
         # Elitismo: conservar los mejores individuos
         if len(new_population) >= 2:
-            new_population[0] = best_individual  # Mejor actual
-            if len(best_history) > 1:
-                new_population[1] = best_history[-2][0]  # Mejor previo
+            new_population[0] = best_params_history[gen]  # Mejor actual
+            if gen > 0:
+                new_population[1] = best_params_history[gen - 1]  # Mejor previo
 
         population = new_population
 
-    return best_history[-1][0], best_history
+    best_history = GAHistory(best_params_history[:n_done], best_fit_history[:n_done])
+    return array_to_params(best_history.params[-1]), float(best_history.fitness[-1]), best_history
 
 
 # ========== THREAD DE OPTIMIZACIÓN (EJECUCIÓN EN SEGUNDO PLANO) ==========
@@ -689,33 +1120,37 @@ class OptimizationThread(QThread):
     - Retorna el mejor resultado de todos los restarts
     
     Señales:
-        progress: Emite porcentaje de avance (0-100)
+        progress: Emite porcentaje de avance (0-100), solo cuando cambia
         status_update: Emite mensajes de estado
-        finished: Emite mejor solución, fitness e historial
+        finished: Emite mejor solución, fitness, historial y filas ya
+                  formateadas para la tabla de resultados
         error: Emite mensaje de error si algo falla
     """
     progress = Signal(int)         # Progreso (0-100)
     status_update = Signal(str)    # Mensajes de estado
-    finished = Signal(dict, float, list)  # (mejor_solución, fitness, historial)
+    finished = Signal(object, float, object, tuple)  # (mejor_solución, fitness, historial, filas)
     error = Signal(str)            # Mensajes de error
 
-    def __init__(self, clinical_data, patient_name, restarts=3, pop_size=60, generations=80):
+    def __init__(self, clinical_data, patient_name, restarts=3, pop_size=60, generations=80, seed=None):
         """
         Inicializa el thread de optimización.
         
         Parámetros:
-            clinical_data: Datos clínicos [(tiempo, BCR_ABL, dosis), ...]
+            clinical_data: Datos clínicos [(tiempo, BCR_ABL, dosis), ...] o ClinicalArrays
             patient_name: Nombre del paciente
             restarts: Número de ejecuciones independientes del GA (3 por defecto)
             pop_size: Tamaño de la población (60 por defecto)
             generations: Generaciones por restart (80 por defecto)
+            seed: Semilla del generador aleatorio; con la misma semilla y datos
+                  la optimización es reproducible (None = aleatoria)
         """
         super().__init__()
-        self.clinical_data = clinical_data
+        self.clinical_data = prepare_clinical_arrays(clinical_data)
         self.patient_name = patient_name
         self.restarts = restarts
         self.pop_size = pop_size
         self.generations = generations
+        self.seed = seed
         self.is_running = True
         self.results = []
         self.best_solution = None
@@ -733,8 +1168,15 @@ class OptimizationThread(QThread):
         - Mejora robustez y evita mínimos locales
         """
         try:
+            # Preprocesar los datos clínicos una sola vez para todos los restarts
+            fitness_data = preprocess_clinical(self.clinical_data)
+            # Fitness memoizados compartidos por todos los restarts
+            fitness_cache = {}
+            # Un solo generador para todos los restarts (reproducible con 'seed')
+            rng = np.random.default_rng(self.seed)
             total_steps = self.restarts * self.generations
             steps_done = 0
+            last_pct = -1
 
             for r in range(self.restarts):
                 if not self.is_running:
@@ -742,10 +1184,13 @@ class OptimizationThread(QThread):
 
                 # Callback para reportar progreso de cada generación
                 def progress_cb(gen, gens_total, best_ind, best_fit):
-                    nonlocal steps_done
+                    nonlocal steps_done, last_pct
                     steps_done += 1
                     progress_val = int((steps_done / total_steps) * 100)
-                    self.progress.emit(progress_val)
+                    # Emitir solo cuando cambia el porcentaje (evita señales encoladas de más)
+                    if progress_val != last_pct:
+                        last_pct = progress_val
+                        self.progress.emit(progress_val)
                     
                     # Reportar cada 10% de las generaciones
                     if gen % max(1, gens_total // 10) == 0 or gen == gens_total - 1:
@@ -754,18 +1199,18 @@ class OptimizationThread(QThread):
                         self.status_update.emit(msg)
 
                 # Ejecutar GA
-                best, history = genetic_algorithm(
-                    self.clinical_data,
+                best, fit, history = genetic_algorithm(
+                    fitness_data,
                     population_size=self.pop_size,
                     generations=self.generations,
                     progress_callback=progress_cb,
-                    stop_check=lambda: self.is_running
+                    stop_check=lambda: self.is_running,
+                    fitness_cache=fitness_cache,
+                    rng=rng
                 )
                 
                 # Solo agregar resultados si no se canceló
                 if self.is_running:
-                    # Calcular fitness final
-                    fit = calculate_fitness(best, self.clinical_data)
                     self.results.append((best, history, fit))
 
             # Solo emitir resultados si no fue cancelado
@@ -774,8 +1219,13 @@ class OptimizationThread(QThread):
                 self.results = sorted(self.results, key=lambda x: x[2], reverse=True)
                 self.best_solution, self.best_history, self.best_fitness = self.results[0]
                 
+                # Formatear aquí (hilo de trabajo) para que la UI solo llene la tabla
+                rows = format_param_rows(self.best_solution)
+                rows.append(("Fitness", f"{self.best_fitness:.6e}"))
+                rows.append(("Error", f"{-self.best_fitness:.6e}"))
+
                 self.progress.emit(100)
-                self.finished.emit(self.best_solution, self.best_fitness, self.best_history)
+                self.finished.emit(self.best_solution, self.best_fitness, self.best_history, tuple(rows))
             elif not self.is_running:
                 # No hacer nada si fue cancelado
                 pass
@@ -804,26 +1254,41 @@ def plot_optimization_results(best_solution, clinical_data):
     
     Parámetros:
         best_solution: Diccionario con los mejores parámetros encontrados
-        clinical_data: Datos clínicos [(tiempo, BCR_ABL, dosis), ...]
+        clinical_data: Datos clínicos [(tiempo, BCR_ABL, dosis), ...] o ndarray (N, 3)
     """
     import matplotlib.pyplot as plt  # Importar bajo demanda
     
+    if isinstance(clinical_data, np.ndarray):
+        # Escalares Python para el bucle del ODE y para las etiquetas
+        clinical_data = clinical_data.tolist()
+    
     time_dose_pairs = sorted([(t, dose) for (t, val, dose) in clinical_data], key=lambda x: x[0])
     t_min = time_dose_pairs[0][0]
     t_max = time_dose_pairs[-1][0]
     time_dense = np.linspace(t_min, t_max, 1000)
+    params_arr = params_to_array(best_solution)
+    dose_times = [t for (t, dose) in time_dose_pairs]
+    dose_values = [dose for (t, dose) in time_dose_pairs]
 
     def model_with_variable_dosing(y, t):
-        current_dose = 1.0
-        for tv, dv in time_dose_pairs:
-            if tv <= t:
-                current_dose = dv
-            else:
-                break
-        return cml_model(y, t, best_solution, dose_factor=current_dose)
+        # Dosis vigente: la del último punto con tiempo <= t (búsqueda binaria)
+        idx = bisect_right(dose_times, t) - 1
+        current_dose = dose_values[idx] if idx >= 0 else 1.0
+        return cml_model(y, t, params_arr, current_dose)
 
-    y0 = get_initial_conditions(best_solution)
-    sol_dense = odeint(model_with_variable_dosing, y0, time_dense, rtol=1e-6, atol=1e-8, mxstep=10000)
+    y0 = get_initial_conditions(params_arr)
+    sol_dense = None
+    if NUMBA_AVAILABLE:
+        # Integrador compilado sobre la malla densa más los cambios de dosis,
+        # con la dosis vigente al inicio de cada tramo (sin volver a Python)
+        times = np.union1d(time_dense, dose_times)
+        idx = np.searchsorted(dose_times, times[:-1], side='right') - 1
+        doses = np.where(idx >= 0, np.asarray(dose_values, dtype=np.float64)[np.maximum(idx, 0)], 1.0)
+        sol, ok = _rk45_solve(y0, times, doses, params_arr, 1e-6, 1e-8, RK45_MAX_STEPS + len(times), np.inf)
+        if ok:
+            sol_dense = sol[np.searchsorted(times, time_dense)]
+    if sol_dense is None:
+        sol_dense = odeint(model_with_variable_dosing, y0, time_dense, rtol=1e-6, atol=1e-8, mxstep=10000)
     Ys = sol_dense[:, 1]
     Zs = sol_dense[:, 2]
     bcr_abl_sim_dense = [100 * calculate_bcr_abl_ratio_decimal(y) for y in Ys]
@@ -833,7 +1298,7 @@ def plot_optimization_results(best_solution, clinical_data):
     nd_times = []
     
     for t, val, dose in clinical_data:
-        if isinstance(val, str) and val.upper() == 'ND':
+        if is_nd(val):
             nd_times.append(t)
         else:
             clinical_times.append(t)
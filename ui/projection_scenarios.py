@@ -7,7 +7,7 @@ def create_info_panel(ax, patient_name, clinical_data, params, scenarios_data=No
     last_month = clinical_months[-1] if clinical_months else 0
 
     # Calcular estadísticas del modelo para interpretación
-    measurable_points = sum(1 for d in clinical_data if not (isinstance(d[1], str) and d[1].upper() == 'ND'))
+    measurable_points = sum(1 for d in clinical_data if not is_nd(d[1]))
     nd_points = len(clinical_data) - measurable_points
 
     # Texto principal
@@ -28,7 +28,7 @@ def create_info_panel(ax, patient_name, clinical_data, params, scenarios_data=No
         info_text += f"{point}\n"
 
     # Si hay escenarios aplicados, añadir nota específica
-    if scenarios_data:
+    if scenarios_data is not None and len(scenarios_data) > 0:
         total_dose_months = sum((end-start) * (dose/100) for start, end, dose in scenarios_data)
         full_dose_months = sum((end-start) for start, end, dose in scenarios_data)
         dose_reduction = (1 - total_dose_months/full_dose_months) * 100 if full_dose_months > 0 else 0
@@ -74,9 +74,9 @@ from scipy.integrate import odeint
 # matplotlib se importa bajo demanda en funciones que lo necesitan
 
 from ui.optimizer_core import (
-    cml_model, get_initial_conditions, 
+    cml_model, get_initial_conditions, params_to_array,
     simulate_model_with_variable_dosing,
-    calculate_bcr_abl_ratio_decimal, DETECTION_LIMIT
+    calculate_bcr_abl_ratio_decimal, is_nd, DETECTION_LIMIT
 )
 
 # ========== DOSIS SCHEDULE ==========
@@ -159,7 +159,7 @@ def project_model_with_strategy(params, clinical_data, strategy_name="tapering",
     - 'continuous': Mantiene dosis constante del último punto
     - 'increased': Aumenta dosis gradualmente
     """
-    if not params or not clinical_data:
+    if not params or len(clinical_data) == 0:
         return None, None
     
     # Extraer últimos datos clínicos
@@ -228,11 +228,9 @@ def evaluate_recurrence_risk(params, clinical_data, projection_months=24):
             # Usar el estado que corresponde al último mes clínico
             y0 = clinical_solution[-1]
         
-        # Simular proyección sin tratamiento
-        def model_no_treatment(y, t):
-            return cml_model(y, t, params, dose_factor=0.0)
-        
-        solution = odeint(model_no_treatment, y0, time_points, rtol=1e-6, atol=1e-8, mxstep=10000)
+        # Simular proyección sin tratamiento (dosis 0.0)
+        solution = odeint(cml_model, y0, time_points, args=(params_to_array(params), 0.0),
+                          rtol=1e-6, atol=1e-8, mxstep=10000)
         Y_proj = solution[:, 1]
         
         # Calcular BCR-ABL durante proyección
@@ -265,10 +263,15 @@ def plot_projection_with_strategies(patient_name, clinical_data, strategies=['ta
     Crea gráficas de proyección con puntos reales y curva completa desde inicio
     Respeta la dosis real del último punto clínico
     
-    scenarios_data: lista de escenarios de la tabla [(mes_inicio, mes_fin, dosis), ...]
+    scenarios_data: escenarios de la tabla [(mes_inicio, mes_fin, dosis), ...]
+                    como lista o arreglo NumPy de forma (N, 3)
     """
     params, error = load_patient_parameters(patient_name)
     
+    if scenarios_data is not None:
+        scenarios_data = np.asarray(scenarios_data, dtype=np.float64).reshape(-1, 3)
+    has_scenarios = scenarios_data is not None and len(scenarios_data) > 0
+    
     if not params:
         return False, "No se encontraron parámetros optimizados para este paciente"
     
@@ -286,7 +289,9 @@ def plot_projection_with_strategies(patient_name, clinical_data, strategies=['ta
             print(f"✓ Usando historial completo: {len(full_historial)} puntos")
             print(f"✓ Dosis desde historial (mismas que optimización)")
         else:
-            # Si no hay historial, usar tabla
+            # Si no hay historial, usar tabla (ndarray con ND = NaN → filas Python)
+            if isinstance(clinical_data, np.ndarray):
+                clinical_data = clinical_data.tolist()
             clinical_data_for_simulation = clinical_data
             clinical_data_for_plotting = clinical_data
             print(f"⚠ Usando datos de tabla: {len(clinical_data)} puntos")
@@ -296,7 +301,7 @@ def plot_projection_with_strategies(patient_name, clinical_data, strategies=['ta
         # Manejar valores 'ND' correctamente
         clinical_bcr_percent = []
         for d in clinical_data_for_plotting:
-            if isinstance(d[1], str) and d[1].upper() == 'ND':
+            if is_nd(d[1]):
                 clinical_bcr_percent.append(DETECTION_LIMIT * 100)  # Usar límite de detección
             else:
                 clinical_bcr_percent.append(d[1] * 100)
@@ -310,9 +315,9 @@ def plot_projection_with_strategies(patient_name, clinical_data, strategies=['ta
         last_clinical_dose = clinical_data_for_simulation[-1][2]  # Dosis del historial
         
         # Determinar el fin de proyección basado en escenarios
-        if scenarios_data:
+        if has_scenarios:
             # Con escenarios: proyectar hasta el mes final del último escenario
-            max_scenario_month = max([mes_fin for _, mes_fin, _ in scenarios_data])
+            max_scenario_month = int(scenarios_data[:, 1].max())
             projection_end = max(max_scenario_month, int(last_clinical_month))
         else:
             # Sin escenarios: NO proyectar, solo graficar hasta último historial clínico
@@ -340,30 +345,32 @@ def plot_projection_with_strategies(patient_name, clinical_data, strategies=['ta
         
         # Generar schedule de proyección según estrategia
         projection_dose_dict = {}
-        if scenarios_data:
+        if has_scenarios:
             # Con escenarios: aplicar desde mes 0 hasta projection_end
             # Los escenarios pueden sobreescribir incluso el período clínico
-            for month in range(0, int(projection_end) + 1):
-                assigned = False
-                for mes_inicio, mes_fin, dosis_pct in scenarios_data:
-                    if mes_inicio <= month <= mes_fin:
-                        projection_dose_dict[month] = dosis_pct / 100.0
-                        assigned = True
-                        break
-                if not assigned:
-                    # Si no hay escenario para este mes, usar dosis clínica si existe
-                    if month <= last_clinical_month:
-                        # Usar dosis del historial clínico
-                        projection_dose_dict[month] = clinical_dose_dict.get(month, last_clinical_dose)
-                    else:
-                        # Después del historial, mantener última dosis clínica
-                        projection_dose_dict[month] = last_clinical_dose
+            # Para cada mes gana el primer escenario que lo contiene
+            months = np.arange(int(projection_end) + 1)
+            starts, ends, doses_pct = scenarios_data.T
+            in_range = (starts[:, None] <= months) & (months <= ends[:, None])
+            assigned = in_range.any(axis=0).tolist()
+            first = in_range.argmax(axis=0).tolist()
+            dose_fractions = (doses_pct / 100.0).tolist()
+            
+            for month in months.tolist():
+                if assigned[month]:
+                    projection_dose_dict[month] = dose_fractions[first[month]]
+                elif month <= last_clinical_month:
+                    # Sin escenario: usar dosis del historial clínico
+                    projection_dose_dict[month] = clinical_dose_dict.get(month, last_clinical_dose)
+                else:
+                    # Después del historial, mantener última dosis clínica
+                    projection_dose_dict[month] = last_clinical_dose
         else:
             # Sin escenarios: usar solo datos clínicos (no proyectar)
             projection_dose_dict = {}
         
         # Usar projection_dose_dict si hay escenarios, sino usar clinical_dose_dict
-        if scenarios_data:
+        if has_scenarios:
             full_dose_dict = projection_dose_dict
         else:
             full_dose_dict = clinical_dose_dict
@@ -384,7 +391,7 @@ def plot_projection_with_strategies(patient_name, clinical_data, strategies=['ta
         print("   que la dosis cambió después del primer punto.")
         print("")
         print("📊 Escenarios de proyección:")
-        if scenarios_data:
+        if has_scenarios:
             print(f"   - Usando {len(scenarios_data)} escenarios definidos en la tabla")
             print(f"   - Proyección hasta mes {projection_end}")
             print(f"   - Gaps sin escenarios: mantienen última dosis ({last_clinical_dose*100:.0f}%)")
@@ -455,7 +462,7 @@ def plot_projection_with_strategies(patient_name, clinical_data, strategies=['ta
         
         # USAR DATOS COMPLETOS PARA GRAFICAR (clinical_data_for_plotting)
         for i, (t, d) in enumerate(zip(clinical_months, clinical_data_for_plotting)):
-            if isinstance(d[1], str) and d[1].upper() == 'ND':
+            if is_nd(d[1]):
                 nd_times.append(t)
             else:
                 clinical_times_measured.append(t)
@@ -514,15 +521,16 @@ def plot_projection_with_strategies(patient_name, clinical_data, strategies=['ta
         ax3.axis('off')
         # Datos clave para la tabla
         total_points = len(clinical_data_for_plotting)
-        measurable_points = sum(1 for d in clinical_data_for_plotting if not (isinstance(d[1], str) and d[1].upper() == 'ND'))
+        measurable_points = sum(1 for d in clinical_data_for_plotting if not is_nd(d[1]))
         nd_points = total_points - measurable_points
         last_bcr = clinical_data_for_plotting[-1][1] if total_points > 0 else None
         last_month = clinical_data_for_plotting[-1][0] if total_points > 0 else None
         # Dosis reducción si hay escenarios
         dose_reduction = None
-        if scenarios_data:
-            total_dose_months = sum((end-start) * (dose/100) for start, end, dose in scenarios_data)
-            full_dose_months = sum((end-start) for start, end, dose in scenarios_data)
+        if has_scenarios:
+            durations = scenarios_data[:, 1] - scenarios_data[:, 0]
+            total_dose_months = float(np.sum(durations * (scenarios_data[:, 2] / 100)))
+            full_dose_months = float(np.sum(durations))
             dose_reduction = (1 - total_dose_months/full_dose_months) * 100 if full_dose_months > 0 else 0
         # Tabla de resumen (sin sistema inmune, con indicación MR4)
         # Calcular si se alcanza TFR: dosis 0 y % leucemia bajo por >=12 meses consecutivos
@@ -547,8 +555,8 @@ def plot_projection_with_strategies(patient_name, clinical_data, strategies=['ta
         table_data = [
             ["Paciente", str(patient_name)],
             ["Puntos clínicos", f"{total_points} ({measurable_points} medibles, {nd_points} ND)"],
-            ["Último mes", f"{last_month}" if last_month is not None else "-"],
-            ["Último % Leucemia", f"{last_bcr:.3%}" if last_bcr is not None and not (isinstance(last_bcr, str) and last_bcr.upper() == 'ND') else "ND"],
+            ["Último mes", f"{last_month:g}" if last_month is not None else "-"],
+            ["Último % Leucemia", f"{last_bcr:.3%}" if last_bcr is not None and not is_nd(last_bcr) else "ND"],
         ]
         table_data.append(["Meta clínica", "MR3, MR4 (>12m)"])
         table_data.append(["Remisión", "% leucemia bajo >12m"])
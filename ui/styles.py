@@ -16,9 +16,15 @@ QFrame#card {
     border-radius: 12px;
     border: 1px solid #D0D0D0;
 }
+/* Sombra simulada (add_shadow): borde inferior/derecho más oscuro */
+QFrame#card[shadowed="true"] {
+    border: 1px solid rgba(0, 0, 0, 40);
+    border-right: 2px solid rgba(0, 0, 0, 60);
+    border-bottom: 2px solid rgba(0, 0, 0, 60);
+}
 
 /* Tabla dentro de la card: fondo blanco para legibilidad */
-QFrame#card QTableWidget, QTableWidget#tabla {
+QFrame#card QTableView, QTableView#tabla {
     background-color: #FFFFFF;
     color: #0B2E13; /* texto oscuro para contraste */
     border-radius: 8px;
@@ -31,7 +37,7 @@ QHeaderView::section {
     border: none;
 }
 /* Fila seleccionada en la tabla */
-QTableWidget::item:selected {
+QTableView::item:selected {
     background-color: #76C893; /* pistacho medio */
     color: #FFFFFF;
 }
@@ -50,37 +56,37 @@ QTableCornerButton::section:pressed {
 }
 
 /* Scrollbars para la tabla (vertical y horizontal) */
-QTableWidget QScrollBar:vertical, QTableWidget#tabla QScrollBar:vertical {
+QTableView QScrollBar:vertical, QTableView#tabla QScrollBar:vertical {
     background: #EAF6EC; /* fondo suave */
     width: 12px;
     margin: 0px 0px 0px 0px;
     border-radius: 6px;
 }
-QTableWidget QScrollBar::handle:vertical, QTableWidget#tabla QScrollBar::handle:vertical {
+QTableView QScrollBar::handle:vertical, QTableView#tabla QScrollBar::handle:vertical {
     background: #78C08F; /* pistacho */
     min-height: 20px;
     border-radius: 6px;
 }
-QTableWidget QScrollBar::handle:vertical:hover, QTableWidget#tabla QScrollBar::handle:vertical:hover {
+QTableView QScrollBar::handle:vertical:hover, QTableView#tabla QScrollBar::handle:vertical:hover {
     background: #5FB57A;
 }
-QTableWidget QScrollBar::add-line:vertical, QTableWidget QScrollBar::sub-line:vertical,
-QTableWidget#tabla QScrollBar::add-line:vertical, QTableWidget#tabla QScrollBar::sub-line:vertical {
+QTableView QScrollBar::add-line:vertical, QTableView QScrollBar::sub-line:vertical,
+QTableView#tabla QScrollBar::add-line:vertical, QTableView#tabla QScrollBar::sub-line:vertical {
     background: none;
     height: 0px;
 }
 
-QTableWidget QScrollBar:horizontal, QTableWidget#tabla QScrollBar:horizontal {
+QTableView QScrollBar:horizontal, QTableView#tabla QScrollBar:horizontal {
     background: #EAF6EC;
     height: 12px;
     border-radius: 6px;
 }
-QTableWidget QScrollBar::handle:horizontal, QTableWidget#tabla QScrollBar::handle:horizontal {
+QTableView QScrollBar::handle:horizontal, QTableView#tabla QScrollBar::handle:horizontal {
     background: #78C08F;
     min-width: 20px;
     border-radius: 6px;
 }
-QTableWidget QScrollBar::handle:horizontal:hover, QTableWidget#tabla QScrollBar::handle:horizontal:hover {
+QTableView QScrollBar::handle:horizontal:hover, QTableView#tabla QScrollBar::handle:horizontal:hover {
     background: #5FB57A;
 }
 
@@ -93,9 +99,40 @@ QFrame#card QLineEdit, QFrame#card QWidget QLineEdit {
     color: #0B2E13;
 }
 
-/* SpinBoxes dentro de la card - sin estilos automáticos */
+/* SpinBoxes dentro de la card: fondo blanco y flechas verdes
+   (los de parámetros del GA, #ga_spin, llevan flechas grises) */
 QFrame#card QSpinBox, QFrame#card QDoubleSpinBox {
-    /* Los estilos se aplicarán individualmente en cada card */
+    background-color: white;
+    color: #333;
+    border: 1px solid #ccc;
+    border-radius: 4px;
+    padding: 2px 2px 2px 4px;
+}
+QFrame#card QSpinBox::up-button, QFrame#card QSpinBox::down-button,
+QFrame#card QDoubleSpinBox::up-button, QFrame#card QDoubleSpinBox::down-button {
+    background-color: #A5D6A7;
+    border: none;
+    border-radius: 2px;
+    width: 16px;
+    margin: 0px;
+}
+QFrame#card QSpinBox::up-button:hover, QFrame#card QSpinBox::down-button:hover,
+QFrame#card QDoubleSpinBox::up-button:hover, QFrame#card QDoubleSpinBox::down-button:hover {
+    background-color: #81C784;
+}
+QFrame#card QSpinBox::up-button:pressed, QFrame#card QSpinBox::down-button:pressed,
+QFrame#card QDoubleSpinBox::up-button:pressed, QFrame#card QDoubleSpinBox::down-button:pressed {
+    background-color: #66BB6A;
+}
+
+QFrame#card QSpinBox#ga_spin::up-button, QFrame#card QSpinBox#ga_spin::down-button {
+    background-color: #d0d0d0;
+}
+QFrame#card QSpinBox#ga_spin::up-button:hover, QFrame#card QSpinBox#ga_spin::down-button:hover {
+    background-color: #b0b0b0;
+}
+QFrame#card QSpinBox#ga_spin::up-button:pressed, QFrame#card QSpinBox#ga_spin::down-button:pressed {
+    background-color: #909090;
 }
 
 /* Combo dentro de la card: pistacho con texto blanco (como botones) */
@@ -143,6 +180,156 @@ QFrame#card QPushButton:pressed {
     background-color: #4A9B64;
 }
 
+/* Botones Agregar / Actualizar / Borrar del historial y de escenarios (pastel) */
+QFrame#card QPushButton#hist_add_btn, QFrame#card QPushButton#hist_update_btn,
+QFrame#card QPushButton#hist_del_btn {
+    border: none;
+    border-radius: 6px;
+    padding: 6px 12px;
+    font-weight: bold;
+    font-size: 12px;
+}
+QFrame#card QPushButton#scen_add_btn, QFrame#card QPushButton#scen_update_btn,
+QFrame#card QPushButton#scen_del_btn {
+    border: none;
+    border-radius: 6px;
+    padding: 4px 10px;
+    font-weight: bold;
+    font-size: 11px;
+}
+QFrame#card QPushButton#hist_add_btn, QFrame#card QPushButton#scen_add_btn {
+    background-color: #C8E6C9;
+    color: #2E7D32;
+}
+QFrame#card QPushButton#hist_add_btn:hover, QFrame#card QPushButton#scen_add_btn:hover {
+    background-color: #A5D6A7;
+}
+QFrame#card QPushButton#hist_add_btn:pressed, QFrame#card QPushButton#scen_add_btn:pressed {
+    background-color: #81C784;
+}
+QFrame#card QPushButton#hist_update_btn, QFrame#card QPushButton#scen_update_btn {
+    background-color: #BBDEFB;
+    color: #1565C0;
+}
+QFrame#card QPushButton#hist_update_btn:hover, QFrame#card QPushButton#scen_update_btn:hover {
+    background-color: #90CAF9;
+}
+QFrame#card QPushButton#hist_update_btn:pressed, QFrame#card QPushButton#scen_update_btn:pressed {
+    background-color: #64B5F6;
+}
+QFrame#card QPushButton#hist_del_btn, QFrame#card QPushButton#scen_del_btn {
+    background-color: #FFCCCC;
+    color: #C62828;
+}
+QFrame#card QPushButton#hist_del_btn:hover, QFrame#card QPushButton#scen_del_btn:hover {
+    background-color: #EF9A9A;
+}
+QFrame#card QPushButton#hist_del_btn:pressed, QFrame#card QPushButton#scen_del_btn:pressed {
+    background-color: #E57373;
+}
+
+/* Pestañas Optimizar / Proyectar (estilo subrayado) */
+QFrame#card QPushButton#tab_btn {
+    background-color: transparent;
+    color: #9E9E9E;
+    border: none;
+    border-bottom: 3px solid transparent;
+    padding: 8px 12px;
+    font-size: 15px;
+    font-weight: normal;
+}
+QFrame#card QPushButton#tab_btn:checked {
+    color: #2E7D32;
+    border-bottom: 3px solid #4CAF50;
+    font-weight: bold;
+}
+QFrame#card QPushButton#tab_btn:hover:!checked {
+    color: #616161;
+}
+
+/* Botones Iniciar / Cancelar / Proyectar / Ver Gráficas (card de proyección) */
+QFrame#card QPushButton#start_btn, QFrame#card QPushButton#stop_btn,
+QFrame#card QPushButton#project_btn, QFrame#card QPushButton#plot_opt_btn {
+    border: none;
+    border-radius: 6px;
+    padding: 6px 12px;
+    font-weight: bold;
+}
+QFrame#card QPushButton#start_btn {
+    background-color: #C8E6C9;
+    color: #2E7D32;
+}
+QFrame#card QPushButton#start_btn:hover {
+    background-color: #A5D6A7;
+}
+QFrame#card QPushButton#start_btn:pressed {
+    background-color: #81C784;
+}
+QFrame#card QPushButton#stop_btn {
+    background-color: #FFCDD2;
+    color: #C62828;
+    font-size: 12px;
+}
+QFrame#card QPushButton#stop_btn:hover:enabled {
+    background-color: #EF9A9A;
+}
+QFrame#card QPushButton#stop_btn:pressed:enabled {
+    background-color: #E57373;
+}
+QFrame#card QPushButton#stop_btn:disabled {
+    background-color: #F0F0F0;
+    color: #AAAAAA;
+}
+QFrame#card QPushButton#project_btn {
+    background-color: #FFE082;
+    color: #F57C00;
+}
+QFrame#card QPushButton#project_btn:hover {
+    background-color: #FFD54F;
+}
+QFrame#card QPushButton#project_btn:pressed {
+    background-color: #FFC107;
+}
+QFrame#card QPushButton#plot_opt_btn {
+    background-color: #BBDEFB;
+    color: #1565C0;
+}
+QFrame#card QPushButton#plot_opt_btn:hover {
+    background-color: #90CAF9;
+}
+QFrame#card QPushButton#plot_opt_btn:pressed {
+    background-color: #64B5F6;
+}
+
+/* Botones de acciones tras la optimización (card de proyección) */
+QFrame#card QPushButton#plots_btn, QFrame#card QPushButton#save_btn {
+    border: none;
+    border-radius: 6px;
+    padding: 6px 12px;
+    font-weight: bold;
+    font-size: 12px;
+}
+QFrame#card QPushButton#plots_btn {
+    background-color: #BBDEFB;
+    color: #1565C0;
+}
+QFrame#card QPushButton#plots_btn:hover {
+    background-color: #90CAF9;
+}
+QFrame#card QPushButton#plots_btn:pressed {
+    background-color: #64B5F6;
+}
+QFrame#card QPushButton#save_btn {
+    background-color: #C8E6C9;
+    color: #2E7D32;
+}
+QFrame#card QPushButton#save_btn:hover {
+    background-color: #A5D6A7;
+}
+QFrame#card QPushButton#save_btn:pressed {
+    background-color: #81C784;
+}
+
 /* Botones del sidebar: mismo estilo que los botones dentro de las cards */
 QFrame#sidebar QPushButton {
     background-color: #78C08F; /* pistacho */
@@ -165,4 +352,157 @@ QLabel {
     font-size: 16px;
     color: #1A2C42;
 }
+/* Título principal de la ventana */
+QLabel#app_title {
+    font-size: 24px;
+    font-weight: bold;
+    color: #1e7d2d;
+    background: none;
+    margin-bottom: 12px;
+    margin-top: 6px;
+    letter-spacing: 2px;
+    padding-left: 16px;
+    padding-right: 16px;
+}
+/* Títulos de las cards */
+QLabel#card_title {
+    font-weight: normal;
+    font-size: 14px;
+    color: #07210F;
+}
+/* Etiquetas de los campos del historial */
+QLabel#field_label {
+    font-size: 12px;
+}
+
+/* Card de paciente */
+QLabel#patient_photo {
+    background-color: #EDF9EE;
+    border: 1px solid #CDE7D2;
+    border-radius: 8px;
+    color: #07210F;
+}
+QLabel#patient_nombre, QLabel#patient_edad, QLabel#patient_sexo, QLabel#patient_clave {
+    background-color: #F2FAF2;
+    color: #07210F;
+    padding: 6px;
+    border-radius: 6px;
+}
+/* Combos de paciente y de estrategias */
+QFrame#card QComboBox#patient_combo, QFrame#card QComboBox#strategy_combo {
+    background-color: #C8E6C9;
+    color: #000000;
+    border: 1px solid #A5D6A7;
+    border-radius: 6px;
+    padding: 2px 4px;
+    font-size: 12px;
+}
+QFrame#card QComboBox#patient_combo::drop-down, QFrame#card QComboBox#strategy_combo::drop-down {
+    border: none;
+    width: 20px;
+}
+QFrame#card QComboBox#patient_combo::down-arrow, QFrame#card QComboBox#strategy_combo::down-arrow {
+    image: none;
+    width: 0px;
+}
+QFrame#card QComboBox#patient_combo QAbstractItemView,
+QFrame#card QComboBox#strategy_combo QAbstractItemView {
+    background-color: #FFFFFF;
+    color: #000000;
+    selection-background-color: #78C08F;
+    border: 1px solid #A5D6A7;
+}
+/* Combo de la card de simulación */
+QFrame#card QComboBox#combo_sim {
+    background-color: #C8E6C9;
+    color: #000000;
+    border: 1px solid #A5D6A7;
+    border-radius: 6px;
+    padding: 2px 4px;
+    font-size: 12px;
+}
+QFrame#card QComboBox#combo_sim::drop-down {
+    border: none;
+    width: 20px;
+    border-radius: 4px;
+}
+QFrame#card QComboBox#combo_sim::down-arrow {
+    image: none;
+    width: 0px;
+}
+QFrame#card QComboBox#combo_sim QAbstractItemView {
+    background-color: #FFFFFF;
+    color: #000000;
+    selection-background-color: #78C08F;
+    border: 1px solid #A5D6A7;
+    border-radius: 6px;
+}
+
+/* Tablas del historial y de escenarios */
+QFrame#card QTableView#history_table, QFrame#card QTableView#scenarios_table {
+    border: none;
+}
+QFrame#card QTableView#history_table::item, QFrame#card QTableView#scenarios_table::item {
+    border-right: none;
+}
+QFrame#card QTableView#history_table QHeaderView::section,
+QFrame#card QTableView#scenarios_table QHeaderView::section {
+    background-color: #C8E6C9;
+    color: #2E7D32;
+    padding: 6px;
+    border: none;
+    font-weight: bold;
+}
+
+/* Mes fin calculado (card de escenarios) */
+QLabel#mes_fin_lbl {
+    font-size: 12px;
+    color: #666;
+    background-color: #f0f0f0;
+    border: 1px solid #ccc;
+    border-radius: 4px;
+    padding: 4px 6px;
+    min-width: 60px;
+    font-weight: bold;
+}
+
+/* Barra de progreso y tabla de resultados (card de proyección) */
+QProgressBar#proj_progress {
+    border: 1px solid #E0E0E0;
+    border-radius: 4px;
+    background-color: #F5F5F5;
+    text-align: center;
+    font-size: 11px;
+}
+QProgressBar#proj_progress::chunk {
+    background-color: #4CAF50;
+    border-radius: 3px;
+}
+QFrame#card QTableView#results_table {
+    border: none;
+}
+QFrame#card QTableView#results_table::item {
+    padding: 4px;
+    border-bottom: 1px solid #F0F0F0;
+    border-right: none;
+}
+QFrame#card QTableView#results_table QHeaderView::section {
+    background-color: #C8E6C9;
+    padding: 4px;
+    border: none;
+    font-weight: bold;
+    color: #000000;
+}
+
+/* Diálogos de aviso / información / error */
+QMessageBox {
+    background-color: white;
+}
+QMessageBox QLabel {
+    background-color: white;
+}
+QMessageBox#warn_box QLabel#qt_msgbox_label {
+    color: red;
+    font-weight: bold;
+}
 """
@@ -0,0 +1,156 @@
+"""
+Modelos de tabla para las vistas de historial, escenarios y resultados
+Los datos viven en una lista de filas; la vista solo pinta lo visible
+"""
+import math
+
+from PySide6.QtCore import Qt, QAbstractTableModel, QModelIndex
+
+
+class _RowTableModel(QAbstractTableModel):
+    """Modelo base: lista de filas (listas de textos) con encabezados fijos
+
+    Junto a cada fila de textos se guarda su versión numérica (ver parse_row),
+    accesible con values() o con Qt.UserRole, para no re-parsear el texto
+    en cada selección o extracción de datos.
+    """
+
+    HEADERS = ()
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._rows = []
+        self._values = []
+
+    @staticmethod
+    def parse_row(row):
+        """Valores numéricos de una fila de textos, o None si no es válida"""
+        return None
+
+    # ---------- API de Qt ----------
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        if role in (Qt.DisplayRole, Qt.EditRole):
+            return self._rows[index.row()][index.column()]
+        if role == Qt.UserRole:
+            values = self._values[index.row()]
+            return None if values is None else values[index.column()]
+        return None
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.HEADERS[section]
+        return super().headerData(section, orientation, role)
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.NoItemFlags
+        return Qt.ItemIsSelectable | Qt.ItemIsEnabled | Qt.ItemIsEditable
+
+    def setData(self, index, value, role=Qt.EditRole):
+        """Edición directa en la celda (p.ej. escribir 'ND')"""
+        if role != Qt.EditRole or not index.isValid():
+            return False
+        row = index.row()
+        self._rows[row][index.column()] = str(value)
+        self._values[row] = self.parse_row(self._rows[row])
+        self.dataChanged.emit(index, index, [Qt.DisplayRole, Qt.EditRole, Qt.UserRole])
+        return True
+
+    # ---------- API de la aplicación ----------
+    def rows(self):
+        """Filas actuales (no modificar directamente)"""
+        return self._rows
+
+    def row(self, row):
+        return self._rows[row]
+
+    def values(self):
+        """Valores numéricos por fila (None en filas no válidas)"""
+        return self._values
+
+    def row_values(self, row):
+        return self._values[row]
+
+    def set_rows(self, rows):
+        """Reemplaza todo el contenido con un único reset del modelo"""
+        self.beginResetModel()
+        self._rows = [list(r) for r in rows]
+        self._values = [self.parse_row(r) for r in self._rows]
+        self.endResetModel()
+
+    def update_rows(self, rows):
+        """Reescribe filas existentes emitiendo un solo dataChanged"""
+        if len(rows) != len(self._rows):
+            self.set_rows(rows)
+            return
+        if not rows:
+            return
+        self._rows = [list(r) for r in rows]
+        self._values = [self.parse_row(r) for r in self._rows]
+        self.dataChanged.emit(
+            self.index(0, 0), self.index(len(rows) - 1, len(self.HEADERS) - 1)
+        )
+
+    def append_row(self, values):
+        row = len(self._rows)
+        self.beginInsertRows(QModelIndex(), row, row)
+        self._rows.append(list(values))
+        self._values.append(self.parse_row(self._rows[-1]))
+        self.endInsertRows()
+
+    def set_row(self, row, values):
+        self._rows[row] = list(values)
+        self._values[row] = self.parse_row(self._rows[row])
+        self.dataChanged.emit(self.index(row, 0), self.index(row, len(self.HEADERS) - 1))
+
+    def remove_row(self, row):
+        self.beginRemoveRows(QModelIndex(), row, row)
+        del self._rows[row]
+        del self._values[row]
+        self.endRemoveRows()
+
+
+class HistoryTableModel(_RowTableModel):
+    """Historial de medicación: Mes, BCR-ABL%, Dosis"""
+
+    HEADERS = ("Mes", "BCR-ABL%", "Dosis")
+
+    @staticmethod
+    def parse_row(row):
+        """(mes, BCR-ABL %, dosis %); 'ND' → NaN y dosis vacía → 0.0"""
+        mes_text, bcr_text, dosis_text = (text.strip() for text in row)
+        try:
+            bcr = math.nan if bcr_text.upper() == 'ND' else float(bcr_text)
+            return (int(mes_text), bcr, float(dosis_text) if dosis_text else 0.0)
+        except ValueError:
+            return None
+
+
+class ScenariosTableModel(_RowTableModel):
+    """Escenarios de tratamiento: Inicio, Duración, Fin, Dosis (%)"""
+
+    HEADERS = ("Inicio", "Duración", "Fin", "Dosis (%)")
+
+    @staticmethod
+    def parse_row(row):
+        """(inicio, duración, fin, dosis %); la dosis se guarda como texto 'NN%'"""
+        inicio_text, duracion_text, fin_text, dosis_text = row
+        try:
+            return (int(inicio_text), int(duracion_text), int(fin_text),
+                    float(dosis_text.strip().rstrip('%')))
+        except ValueError:
+            return None
+
+
+class ResultsTableModel(_RowTableModel):
+    """Resultados de la optimización: Parámetro, Valor (textos ya formateados)"""
+
+    HEADERS = ("Parámetro", "Valor")